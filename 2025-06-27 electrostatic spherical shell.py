@@ -1,34 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
-
-# Building blocks: Point charge and Electrostatic Field
-class Charge:
-    # Constant:
-    epsilon0 = 8.854e-12
-    k = 1/(4*np.pi*epsilon0)
-
-    def __init__ (self,
-                  magnitude: float,
-                  position = np.array([0, 0, 0]),
-                  ):
-        self.magnitude = magnitude
-        self.position = position
-        
-    def electric_field(self, Rx, Ry, Rz):
-        R_squared = Rx**2 + Ry**2 + Rz**2
-        R = np.sqrt(R_squared)
-        R_cubed = np.where(R_squared != 0, R_squared * R, 1e-20)  # evitar división por cero
-        coeff = Charge.k * self.magnitude / R_cubed
-        Ex = coeff * Rx
-        Ey = coeff * Ry
-        Ez = coeff * Rz
-        return [Ex, Ey, Ez]
-    
-    def scalar_potential(self, Rx, Ry, Rz):
-        R_squared = Rx**2 + Ry**2 + Rz**2
-        R = np.where(R_squared != 0, np.sqrt(R_squared), 1e-20)  # evitar división por cero
-        V = Charge.k * self.magnitude / R
-        return V
+import utils
+import symmetry
+import vtk_export
 
 # Primero definamos dónde crear la carga (coordenadas esféricas)
 samples_theta = 50
@@ -69,9 +43,12 @@ for theta in theta_samples:
         magnitude = surface_charge_density * surface_differential(rho, phi, delta_theta, delta_phi)
 
         # Create a point charge:
-        charge_list.append(Charge(magnitude, position))
+        charge_list.append(utils.PointCharge(magnitude, position))
 print(f"Number of point charges = {len(charge_list)}")
 
+# Agrupar la cáscara: los puntos lejanos usan su expansión multipolar
+shell = utils.ChargeDistribution(charge_list)
+
 
 
 # Definir Meshgrid:
@@ -84,24 +61,8 @@ X, Y, Z = np.meshgrid(x_space, y_space, z_space)
 
 print(f"Shape of the meshgrid: {X.shape}")
 
-# Inicializar componentes del campo:
-Ex = np.zeros_like(X)
-Ey = np.zeros_like(Y)
-Ez = np.zeros_like(Z)
-
-for charge in charge_list:
-
-    # Vector de posición desde carga hacia cada punto del espacio
-    Rx = X - charge.position[0]
-    Ry = Y - charge.position[1]
-    Rz = Z - charge.position[2]
-    # print(Rx.shape)
-
-    E_differential = Charge.electric_field(charge, Rx, Ry, Rz)
-    # Sumar componentes del campo
-    Ex += E_differential[0]
-    Ey += E_differential[1]
-    Ez += E_differential[2]
+# Calcular campo eléctrico total (solo en el dominio fundamental de la escena):
+Ex, Ey, Ez = symmetry.symmetric_electric_field([shell], x_space, y_space, z_space)
 
 # PLOT:
 fig = plt.figure(figsize=(10, 8))
@@ -148,20 +109,13 @@ plt.show()
 
 # AHORA PARA EL POTENCIAL:
 
-# Inicializar componentes :
-V = np.zeros_like(X)
-
-for charge in charge_list:
-
-    # Vector de posición desde carga hacia cada punto del espacio
-    Rx = X - charge.position[0]
-    Ry = Y - charge.position[1]
-    Rz = Z - charge.position[2]
-    print(Rx.shape)
+# Calcular potencial total:
+V = symmetry.symmetric_electric_potential([shell], x_space, y_space, z_space)
 
-    V_differential = Charge.scalar_potential(charge, Rx, Ry, Rz)
-    # Sumar componentes del campo
-    V += V_differential
+# Exportar a ParaView (VTK ImageData binario):
+export_vtk = False
+if export_vtk:
+    vtk_export.write_vti("spherical_shell.vti", x_space, y_space, z_space, {"V": V, "E": (Ex, Ey, Ez)})
 
 # PLOT:
 # Flatten the grid and potential arrays
@@ -0,0 +1,202 @@
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import LinearOperator, gmres
+from em_geometry_2d import ke, _multi_indices, _coulomb_taylor
+
+""" Conductores: distribución real de la carga sobre los objetos de em_geometry_2d.
+
+    En lugar de repartir la carga uniformemente entre las muestras, se buscan
+    las cargas de cada muestra que dejan a cada objeto a un potencial
+    constante (método de elementos de frontera por colocación). El sistema se
+    resuelve una vez por objeto con potencial unitario; esas soluciones y la
+    matriz de capacitancia quedan en caché, así que cambiar potenciales o
+    cargas totales sobre la misma geometría no requiere resolver de nuevo.
+"""
+# Distancia mínima del núcleo 1/r (la misma que usa Charge.potential)
+r_min = 1e-2
+
+
+class ConductorSystem:
+    def __init__(
+            self,
+            conductor_list: list,
+            tolerance: float = 1e-10,
+            ):
+        """
+        Prepara la geometría (fija) de un conjunto de conductores.
+
+        Args:
+            conductor_list (list): Objetos de em_geometry_2d (Point, Line2, Circle...).
+            tolerance (float): Tolerancia relativa del solver iterativo.
+        """
+        self.conductor_list = conductor_list
+        self.tolerance = tolerance
+
+        # Muestras repetidas dentro de un objeto (p. ej. el cierre de Circle)
+        # comparten una sola incógnita.
+        self.nodes = []
+        offset = 0
+        for Q in conductor_list:
+            points = np.round(np.column_stack([Q.x, Q.y]), 12)
+            unique, inverse, counts = np.unique(points, axis=0, return_inverse=True, return_counts=True)
+            self.nodes.append({
+                "x": unique[:, 0],
+                "y": unique[:, 1],
+                "inverse": inverse.ravel(),
+                "counts": counts,
+                "slice": slice(offset, offset + len(unique)),
+            })
+            offset += len(unique)
+        self.size = offset
+
+        self._blocks = None
+        self._preconditioner = None
+        self._unit_solutions = None
+        self._capacitance = None
+
+    # Operador del sistema: potencial en los nodos debido a las cargas de los nodos
+    def _kernel(self, xt, yt, xs, ys):
+        r = np.sqrt((xt[:, None] - xs[None, :]) ** 2 + (yt[:, None] - ys[None, :]) ** 2)
+        return ke / np.maximum(r, r_min)
+
+    def _build_blocks(self):
+        """
+        Bloques del operador: densos entre objetos cercanos y factorizados
+        (expansión multipolar, de bajo rango) entre objetos bien separados.
+
+        Un bloque se factoriza solo si el error de la expansión queda bajo la
+        tolerancia del solver en todos sus nodos y si el producto factorizado
+        es más barato que el denso. En las geometrías típicas (objetos
+        anidados o a pocas veces su tamaño, como los condensadores de los
+        ejemplos) ningún bloque cumple ambas condiciones: el operador queda
+        denso, O(N²) por producto, que con cientos de nodos sigue siendo lo
+        más barato.
+        """
+        blocks = []
+        for m, target in enumerate(self.nodes):
+            for n, (Qs, source) in enumerate(zip(self.conductor_list, self.nodes)):
+                center = np.array([np.mean(source["x"]), np.mean(source["y"])])
+                dx = center[0] - source["x"]
+                dy = center[1] - source["y"]
+                radius = np.max(np.sqrt(dx ** 2 + dy ** 2))
+                indices = _multi_indices(Qs.multipole_order)
+                # Error relativo ~ (radius / r)^(orden + 1), acotado por la tolerancia del solver
+                safe_radius = radius / self.tolerance ** (1 / (Qs.multipole_order + 1))
+                Rx = target["x"] - center[0]
+                Ry = target["y"] - center[1]
+                nt, ns = len(Rx), len(dx)
+                cheaper = len(indices) * (nt + ns) < nt * ns
+                if m != n and cheaper and np.all(Rx ** 2 + Ry ** 2 > max(safe_radius ** 2, r_min ** 2)):
+                    # V_t = ke Σ_k a_k(t) M_k, con M_k = Σ_s q_s (c - s)^k
+                    a = _coulomb_taylor(Rx, Ry, Qs.multipole_order)
+                    A = ke * np.column_stack([a[k] for k in indices])
+                    P = np.vstack([dx ** k[0] * dy ** k[1] for k in indices])
+                    blocks.append((target["slice"], source["slice"], (A, P)))
+                else:
+                    K = self._kernel(target["x"], target["y"], source["x"], source["y"])
+                    blocks.append((target["slice"], source["slice"], K))
+        return blocks
+
+    def matvec(self, q: np.ndarray) -> np.ndarray:
+        """ Potencial en todos los nodos producido por las cargas q de los nodos. """
+        if self._blocks is None:
+            self._blocks = self._build_blocks()
+        V = np.zeros(self.size)
+        for target, source, block in self._blocks:
+            if isinstance(block, tuple):
+                A, P = block
+                V[target] += A @ (P @ q[source])
+            else:
+                V[target] += block @ q[source]
+        return V
+
+    def _precondition(self, V: np.ndarray) -> np.ndarray:
+        """ Precondicionador de bloques diagonales (LU de cada objeto, en caché). """
+        if self._preconditioner is None:
+            self._preconditioner = []
+            for node in self.nodes:
+                K = self._kernel(node["x"], node["y"], node["x"], node["y"])
+                self._preconditioner.append((node["slice"], lu_factor(K)))
+        q = np.zeros_like(V)
+        for nodes, factorization in self._preconditioner:
+            q[nodes] = lu_solve(factorization, V[nodes])
+        return q
+
+    def unit_solutions(self) -> np.ndarray:
+        """
+        Cargas de los nodos cuando el objeto m está a 1 V y los demás a 0 V.
+
+        Returns:
+            np.ndarray: Matriz (nodos, objetos); la columna m es la solución m.
+        """
+        if self._unit_solutions is None:
+            operator = LinearOperator((self.size, self.size), matvec=self.matvec, dtype=float)
+            preconditioner = LinearOperator((self.size, self.size), matvec=self._precondition, dtype=float)
+            solutions = np.zeros((self.size, len(self.nodes)))
+            for m, node in enumerate(self.nodes):
+                b = np.zeros(self.size)
+                b[node["slice"]] = 1
+                q, info = gmres(operator, b, M=preconditioner, rtol=self.tolerance,
+                                atol=0, restart=min(self.size, 200), maxiter=50)
+                if info != 0:
+                    raise RuntimeError(f"El solver no convergió para el conductor {m}.")
+                solutions[:, m] = q
+            self._unit_solutions = solutions
+        return self._unit_solutions
+
+    def capacitance_matrix(self) -> np.ndarray:
+        """
+        Matriz de capacitancia C (F): Q_n = Σ_m C[n, m] V_m.
+
+        Returns:
+            np.ndarray: Matriz (objetos, objetos).
+        """
+        if self._capacitance is None:
+            X = self.unit_solutions()
+            self._capacitance = np.array([X[node["slice"]].sum(axis=0) for node in self.nodes])
+        return self._capacitance
+
+    def solve(
+            self,
+            potentials: list = None,
+            charges: list = None,
+            ) -> np.ndarray:
+        """
+        Redistribuye la carga de cada objeto como en un conductor.
+
+        Cada objeto necesita exactamente uno de los dos datos: su potencial o su
+        carga total (usar None en la otra lista). Si no se da ninguna lista,
+        cada objeto conserva su carga total actual.
+
+        Args:
+            potentials (list, opcional): Potencial (V) de cada objeto, o None.
+            charges (list, opcional): Carga total (C) de cada objeto, o None.
+
+        Returns:
+            np.ndarray: Potencial (V) de cada objeto.
+        """
+        M = len(self.nodes)
+        if potentials is None and charges is None:
+            charges = [np.sum(Q.DeltaQ) for Q in self.conductor_list]
+        potentials = [None] * M if potentials is None else list(potentials)
+        charges = [None] * M if charges is None else list(charges)
+        if len(potentials) != M or len(charges) != M:
+            raise ValueError("Se requiere un dato por conductor.")
+        fixed = np.array([V is not None for V in potentials])
+        if np.any(fixed == np.array([Q is not None for Q in charges])):
+            raise ValueError("Cada conductor necesita su potencial o su carga total (solo uno).")
+
+        # Potenciales de los objetos con carga total dada: C_ff U_f = Q_f - C_fp U_p
+        C = self.capacitance_matrix()
+        U = np.array([V if V is not None else 0.0 for V in potentials], dtype=float)
+        free = ~fixed
+        if np.any(free):
+            Q_free = np.array([Q for Q in charges if Q is not None], dtype=float)
+            U[free] = np.linalg.solve(C[np.ix_(free, free)], Q_free - C[np.ix_(free, fixed)] @ U[fixed])
+
+        # Cargas de los nodos y de cada muestra
+        q = self.unit_solutions() @ U
+        for Q, node in zip(self.conductor_list, self.nodes):
+            q_node = q[node["slice"]] / node["counts"]
+            Q.set_sample_charges(q_node[node["inverse"]])
+        return U
@@ -2,22 +2,55 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.constants import e, epsilon_0, pi
 from matplotlib.colors import TwoSlopeNorm
+from matplotlib.collections import LineCollection
+from scipy.spatial import cKDTree
 
 # Atajos:
 O = np.array([0, 0])
 ke = 1 / (4 * pi * epsilon_0)
 
+# Expansión multipolar en el plano. Es la versión 2D de utils._multi_indices y
+# utils._coulomb_taylor: este paquete se ejecuta desde su propia carpeta y no
+# importa los módulos de la raíz del repositorio.
+def _multi_indices(order: int) -> list:
+    """ Multi-índices (i, j) con i + j <= order, ordenados por grado total. """
+    return sorted([(i, j) for i in range(order + 1) for j in range(order + 1 - i)], key=sum)
+
+def _coulomb_taylor(Rx: np.ndarray, Ry: np.ndarray, order: int) -> dict:
+    """ Coeficientes de Taylor a_k = (1/k!) ∂^k (1/r) en el plano, para |k| <= order. """
+    inv_r_squared = 1 / (Rx ** 2 + Ry ** 2)
+    a = {(0, 0): np.sqrt(inv_r_squared)}
+    for (i, j) in _multi_indices(order)[1:]:
+        n = i + j
+        first = np.zeros_like(inv_r_squared)
+        second = np.zeros_like(inv_r_squared)
+        if i >= 1:
+            first += Rx * a[(i - 1, j)]
+        if j >= 1:
+            first += Ry * a[(i, j - 1)]
+        if i >= 2:
+            second += a[(i - 2, j)]
+        if j >= 2:
+            second += a[(i, j - 2)]
+        a[(i, j)] = -((2 * n - 1) / n * first + (n - 1) / n * second) * inv_r_squared
+    return a
+
 class Charge:
+    # Expansión multipolar para puntos lejanos (se puede cambiar por objeto)
+    multipole_order = 8
+    multipole_tolerance = 1e-12
+
     def __init__(
             self,
             charge: float = 1,
             number_of_samples: int = 1
             ):
-        self.DeltaQ = charge/number_of_samples
+        self.DeltaQ = np.full(number_of_samples, charge/number_of_samples)
         self.range = range(0, number_of_samples)
         self.init_color(charge)
         self.x = None  # Definir en subclase
         self.y = None  # Definir en subclase
+        self._multipole = None
 
     def init_color(self, Q):
         if Q > 0:
@@ -27,14 +60,69 @@ class Charge:
         else:
             self.color = "black"
 
-    def potential(self, X: np.meshgrid, Y: np.meshgrid) -> np.meshgrid:
-        V = np.zeros_like(X)
+    def set_sample_charges(self, DeltaQ: np.ndarray) -> None:
+        """ Reemplaza la carga de cada muestra (p. ej. con la solución de un conductor). """
+        DeltaQ = np.asarray(DeltaQ, dtype=float)
+        if DeltaQ.shape != (len(self.range),):
+            raise ValueError("Se requiere una carga por muestra.")
+        self.DeltaQ = DeltaQ
+        self.init_color(DeltaQ.sum())
+        self._multipole = None
+
+    def multipole(self) -> tuple:
+        """
+        Precalcula (una vez) el centro, el radio seguro y los momentos
+        M_k = Σ ΔQ (c - r_k)^k de las muestras hasta multipole_order.
+
+        Si la expansión tiene al menos tantos términos como muestras, no es
+        más barata que la suma directa y el radio seguro es infinito.
+        """
+        if self._multipole is None:
+            center = np.array([np.mean(self.x), np.mean(self.y)])
+            dx = center[0] - self.x
+            dy = center[1] - self.y
+            radius = np.max(np.sqrt(dx ** 2 + dy ** 2))
+            indices = _multi_indices(self.multipole_order)
+            if len(indices) < len(self.range):
+                # Error relativo ~ (radius / r)^(orden + 1) fuera del radio seguro
+                safe_radius = radius / self.multipole_tolerance ** (1 / (self.multipole_order + 1))
+                moments = {k: np.sum(self.DeltaQ * dx ** k[0] * dy ** k[1]) for k in indices}
+            else:
+                safe_radius = np.inf
+                moments = {}
+            self._multipole = (center, safe_radius, moments)
+        return self._multipole
+
+    def direct_potential(self, X: np.meshgrid, Y: np.meshgrid) -> np.meshgrid:
+        """ Suma directa muestra por muestra. """
+        V = np.zeros(np.broadcast_shapes(np.shape(X), np.shape(Y)), dtype=np.result_type(X, Y, float))
         for k in self.range:
             Rx = X - self.x[k]
             Ry = Y - self.y[k]
             r_squared = Rx ** 2 + Ry ** 2
             r = np.where(r_squared > 1e-4, np.sqrt(r_squared), 1e-2)
-            V = V + ke * self.DeltaQ / r
+            V += ke * self.DeltaQ[k] / r
+        return V
+
+    def potential(self, X: np.meshgrid, Y: np.meshgrid) -> np.meshgrid:
+        center, safe_radius, moments = self.multipole()
+        if np.isinf(safe_radius):
+            return self.direct_potential(X, Y)
+        V = np.zeros(np.shape(X), dtype=np.result_type(X, float))
+        far = (X - center[0]) ** 2 + (Y - center[1]) ** 2 > max(safe_radius ** 2, 1e-4)
+
+        # Puntos lejanos: V = ke Σ_k a_k M_k
+        if np.any(far):
+            a = _coulomb_taylor(X[far] - center[0], Y[far] - center[1], self.multipole_order)
+            V_far = np.zeros(np.count_nonzero(far))
+            for k, M in moments.items():
+                V_far += M * a[k]
+            V[far] = ke * V_far
+
+        # Puntos cercanos: suma directa muestra por muestra
+        near = ~far
+        if np.any(near):
+            V[near] = self.direct_potential(X[near], Y[near])
         return V
 
 class Point(Charge):
@@ -79,29 +167,445 @@ class Circle(Charge):
         self.x = radius * np.cos(t) + center[0]
         self.y = radius * np.sin(t) + center[1]
 
-def plot_field(charge_list: Charge, x: np.ndarray, y: np.ndarray) -> None:
-    [X, Y] = np.meshgrid(x, y)
+# Simetrías de la malla respecto a su centro: transformación de las muestras
+# (dx, dy relativos al centro).
+_symmetry_transforms = {
+    "mirror_x": lambda dx, dy: (-dx, dy),
+    "mirror_y": lambda dx, dy: (dx, -dy),
+    "rotation_180": lambda dx, dy: (-dx, -dy),
+    "diagonal": lambda dx, dy: (dy, dx),
+    "rotation_90": lambda dx, dy: (-dy, dx),
+}
+def _grid_supports(name: str, x: np.ndarray, y: np.ndarray, tolerance: float) -> bool:
+    """ Indica si la malla se transforma en sí misma con la simetría 'name'. """
+    dx = x - (x[0] + x[-1]) / 2
+    dy = y - (y[0] + y[-1]) / 2
+    x_mirror = np.allclose(dx, -dx[::-1], atol=tolerance, rtol=0)
+    y_mirror = np.allclose(dy, -dy[::-1], atol=tolerance, rtol=0)
+    if name == "mirror_x":
+        return x_mirror
+    if name == "mirror_y":
+        return y_mirror
+    if name == "rotation_180":
+        return x_mirror and y_mirror
+    # Diagonal y 90°: la malla debe ser la misma en x y en y
+    return len(x) == len(y) and np.allclose(dx, dy, atol=tolerance, rtol=0) and x_mirror
 
-    V = np.zeros_like(X)
-    for Q in charge_list:
-        V = V + Q.potential(X, Y)
+def detect_symmetries(charge_list: list, x: np.ndarray, y: np.ndarray, tolerance: float = 1e-9) -> list:
+    """
+    Busca simetrías de la escena respecto al centro de la malla: reflexiones
+    (mirror_x, mirror_y, diagonal) y rotaciones (rotation_180, rotation_90).
+    La paridad es +1 si la escena queda igual y -1 si las cargas cambian de signo.
 
-    Ey, Ex = np.gradient(-V, y, x)
+    Returns:
+        list: Pares (nombre, paridad).
+    """
+    px = np.concatenate([Q.x for Q in charge_list])
+    py = np.concatenate([Q.y for Q in charge_list])
+    q = np.concatenate([np.broadcast_to(Q.DeltaQ, np.shape(Q.x)) for Q in charge_list])
+    center = np.array([(x[0] + x[-1]) / 2, (y[0] + y[-1]) / 2])
+    scale = max(np.ptp(x), np.ptp(y), np.ptp(px), np.ptp(py))
+    distance = tolerance * scale
+
+    # Versión plana de symmetry.detect_symmetries (raíz del repositorio): este
+    # paquete se ejecuta desde su propia carpeta y no importa esos módulos.
+    # Las muestras repetidas se agrupan sumando la carga a menos de 'distance'.
+    tree = cKDTree(np.column_stack([px, py]))
+    def charge_near(qx, qy):
+        neighbours = tree.query_ball_point(np.column_stack([qx, qy]), r=distance)
+        return np.array([q[n].sum() for n in neighbours])
+    own = charge_near(px, py)
+    charge_tolerance = tolerance * np.abs(q).max()
+
+    symmetries = []
+    for name, transform in _symmetry_transforms.items():
+        if not _grid_supports(name, x, y, distance):
+            continue
+        tx, ty = transform(px - center[0], py - center[1])
+        image = charge_near(tx + center[0], ty + center[1])
+        for parity in (+1, -1):
+            if np.allclose(image, parity * own, atol=charge_tolerance, rtol=0):
+                symmetries.append((name, parity))
+                break
+    return symmetries
+
+def _check_symmetries(evaluate, x: np.ndarray, y: np.ndarray, symmetries: list, probes: int = 16) -> None:
+    """
+    Verifica simetrías declaradas: la malla debe transformarse en sí misma y
+    la escena debe cumplir V(T p) = paridad · V(p) en unos pocos puntos p de
+    la malla (respecto a su centro). Si no, ValueError.
+    """
+    distance = 1e-9 * max(np.ptp(x), np.ptp(y))
+    center = np.array([(x[0] + x[-1]) / 2, (y[0] + y[-1]) / 2])
+    rng = np.random.default_rng(0)
+    px = x[rng.integers(0, len(x), probes)].astype(float)
+    py = y[rng.integers(0, len(y), probes)].astype(float)
+    own = evaluate(px, py)
+    for name, parity in symmetries:
+        if name not in _symmetry_transforms:
+            raise ValueError(f"Simetría desconocida: '{name}'.")
+        if not _grid_supports(name, x, y, distance):
+            raise ValueError(f"La malla no es simétrica respecto a '{name}'.")
+        tx, ty = _symmetry_transforms[name](px - center[0], py - center[1])
+        image = evaluate(tx + center[0], ty + center[1])
+        if not np.allclose(image, parity * own, atol=1e-6 * np.abs(own).max(), rtol=0):
+            raise ValueError(f"La escena no tiene la simetría ('{name}', {parity:+d}) respecto al centro de la malla.")
+
+def _fundamental_domain(evaluate, x: np.ndarray, y: np.ndarray, symmetries: dict) -> np.ndarray:
+    """
+    Evalúa evaluate(X, Y) solo en un dominio fundamental de np.meshgrid(x, y)
+    y completa la malla copiando con np.flip / .T y la paridad:
+        - mirror_x / mirror_y: la primera mitad de columnas / filas;
+        - rotation_180 (sin reflexiones): la primera mitad de filas;
+        - diagonal (malla cuadrada restante): el triángulo superior.
+    rotation_90 no reduce más el dominio: sus órbitas ya las cubren las demás
+    simetrías cuando están presentes.
+    """
+    nx, ny = len(x), len(y)
+    mirror_x = "mirror_x" in symmetries
+    mirror_y = "mirror_y" in symmetries
+    rotation = "rotation_180" in symmetries and not (mirror_x or mirror_y)
+    hx = (nx + 1) // 2 if mirror_x else nx
+    hy = (ny + 1) // 2 if mirror_y or rotation else ny
+
+    X, Y = np.meshgrid(x[:hx], y[:hy])
+    if "diagonal" in symmetries and hx == hy and mirror_x == mirror_y and not rotation:
+        upper = np.triu_indices(hx)
+        V = np.zeros((hy, hx))
+        V[upper] = evaluate(X[upper], Y[upper])
+        V = V + symmetries["diagonal"] * np.triu(V, 1).T
+    else:
+        V = evaluate(X, Y)
+
+    # Completar: cada mitad copiada es la imagen de la ya calculada
+    if rotation:
+        V = np.concatenate([V, symmetries["rotation_180"] * np.flip(V[:ny // 2], axis=(0, 1))], axis=0)
+    if mirror_y:
+        V = np.concatenate([V, symmetries["mirror_y"] * np.flip(V[:ny // 2], axis=0)], axis=0)
+    if mirror_x:
+        V = np.concatenate([V, symmetries["mirror_x"] * np.flip(V[:, :nx // 2], axis=1)], axis=1)
+    return V
+
+def symmetric_potential(charge_list: list, x: np.ndarray, y: np.ndarray, symmetries="auto") -> np.ndarray:
+    """
+    Potencial total en np.meshgrid(x, y) evaluando solo un dominio fundamental
+    y completando la malla con las simetrías.
+
+    Args:
+        charge_list (list): Objetos Charge.
+        x (np.ndarray): Coordenadas x de la malla.
+        y (np.ndarray): Coordenadas y de la malla.
+        symmetries: "auto" para detectarlas, o lista de pares (nombre, paridad).
+
+    Returns:
+        np.ndarray: V con la forma de np.meshgrid(x, y).
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    def evaluate(X, Y):
+        V = np.zeros(np.shape(X))
+        for Q in charge_list:
+            V = V + Q.potential(X, Y)
+        return V
+
+    if symmetries == "auto":
+        symmetries = detect_symmetries(charge_list, x, y)
+    else:
+        _check_symmetries(evaluate, x, y, symmetries)
+    return _fundamental_domain(evaluate, x, y, dict(symmetries))
+
+# Renderizado rápido: imagen RGBA directa, sin contourf ni streamplot
+_lut_cache = {}
+
+def _colormap_lut(cmap: str, size: int = 256) -> np.ndarray:
+    """ Tabla (size, 4) de colores RGBA uint8 de un mapa de colores (en caché). """
+    if (cmap, size) not in _lut_cache:
+        colors = plt.get_cmap(cmap)(np.linspace(0, 1, size))
+        _lut_cache[(cmap, size)] = np.round(255 * colors).astype(np.uint8)
+    return _lut_cache[(cmap, size)]
+
+def _grid_step(space: np.ndarray) -> float:
+    """ Paso de un eje; el renderizado rápido requiere ejes equiespaciados. """
+    steps = np.diff(space)
+    if not np.allclose(steps, steps[0], rtol=1e-6, atol=0):
+        raise ValueError("El renderizado rápido requiere ejes equiespaciados.")
+    return float(steps[0])
+
+def rasterize_potential(
+        V: np.ndarray,
+        vmin: float,
+        vcenter: float,
+        vmax: float,
+        levels: int = 20,
+        cmap: str = 'RdBu_r',
+        line_color: tuple = (255, 255, 255, 255),
+        ) -> np.ndarray:
+    """
+    Imagen RGBA de V con la misma normalización de dos pendientes que
+    plot_field y equipotenciales marcadas donde cambia el nivel cuantizado.
+
+    Args:
+        V (np.ndarray): Potencial en np.meshgrid(x, y).
+        vmin (float): Potencial del extremo inferior del mapa de colores.
+        vcenter (float): Potencial del centro del mapa de colores.
+        vmax (float): Potencial del extremo superior del mapa de colores.
+        levels (int): Número de equipotenciales (niveles equiespaciados).
+        cmap (str): Nombre del mapa de colores.
+        line_color (tuple): Color RGBA (0-255) de las equipotenciales.
+
+    Returns:
+        np.ndarray: Arreglo uint8 (ny, nx, 4), con filas en y creciente.
+    """
+    # Cada color RGBA como un uint32: la imagen se arma con un solo np.take
+    lut = _colormap_lut(cmap).view(np.uint32).ravel()
+    half = len(lut) / 2
+    below = half / max(vcenter - vmin, 1e-300)
+    above = (half - 1e-6) / max(vmax - vcenter, 1e-300)
+    t = V - vcenter
+    t *= np.where(t < 0, below, above)
+    t += half
+    np.clip(t, 0, len(lut) - 1, out=t)
+    image = np.take(lut, t.astype(np.intp))
+
+    # Equipotenciales: píxeles donde el nivel cuantizado cambia respecto al vecino
+    if levels > 0:
+        level = np.floor((V - vmin) * (levels / max(vmax - vmin, 1e-300))).astype(np.intp)
+        edge = np.zeros(V.shape, dtype=bool)
+        edge[:, 1:] |= level[:, 1:] != level[:, :-1]
+        edge[1:, :] |= level[1:, :] != level[:-1, :]
+        image[edge] = np.array(line_color, dtype=np.uint8).view(np.uint32)[0]
+    return image.view(np.uint8).reshape(V.shape + (4,))
+
+def trace_field_lines(
+        Ex: np.ndarray,
+        Ey: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        density: float = 1.5,
+        strides: tuple = (8, 4, 2, 1),
+        ) -> tuple:
+    """
+    Traza líneas de campo a partir de semillas en una malla, todas a la vez
+    (Runge-Kutta de 2º orden sobre la dirección del campo, interpolada
+    bilinealmente). Como en streamplot, una línea se detiene al entrar en una
+    celda ya ocupada por otra línea, al salir de la malla o al cruzar una carga.
+
+    Args:
+        Ex (np.ndarray): Componente x del campo en np.meshgrid(x, y).
+        Ey (np.ndarray): Componente y del campo en np.meshgrid(x, y).
+        x (np.ndarray): Coordenadas x (equiespaciadas).
+        y (np.ndarray): Coordenadas y (equiespaciadas).
+        density (float): Como en streamplot: 30 * density celdas por lado.
+        strides (tuple): Separación (en celdas) de las semillas de cada tanda;
+                         en cada tanda solo parten las de celdas libres.
+
+    Returns:
+        tuple: (segmentos (S, 2, 2) en coordenadas (x, y), |E| en cada segmento)
+    """
+    ny, nx = Ex.shape
+    dx, dy = _grid_step(x), _grid_step(y)
+    magnitude = np.sqrt(Ex ** 2 + Ey ** 2)
+    safe_magnitude = np.where(magnitude != 0, magnitude, 1e-20)  # evitar división por cero
+    # Dirección unitaria del campo, en índices de la malla por metro
+    direction = np.empty((ny * nx, 2))
+    direction[:, 0] = (Ex / (safe_magnitude * dx)).ravel()
+    direction[:, 1] = (Ey / (safe_magnitude * dy)).ravel()
+    direction[magnitude.ravel() == 0] = 0
+
+    # Celdas de ocupación (como streamplot) y paso de media celda
+    cells = max(int(30 * density), 2)
+    cell_x = (nx - 1) / cells
+    cell_y = (ny - 1) / cells
+    h = 0.5 * min(cell_x * dx, cell_y * dy)
+    max_steps = int(4 * cells / 0.5)
+    occupied = np.full(cells * cells, -1)
+
+    def sample(p):
+        i0 = np.minimum(np.maximum(p[:, 0], 0).astype(np.intp), nx - 2)
+        j0 = np.minimum(np.maximum(p[:, 1], 0).astype(np.intp), ny - 2)
+        fx = (p[:, 0] - i0)[:, None]
+        fy = (p[:, 1] - j0)[:, None]
+        k = j0 * nx + i0
+        return ((1 - fy) * ((1 - fx) * direction[k] + fx * direction[k + 1])
+                + fy * ((1 - fx) * direction[k + nx] + fx * direction[k + nx + 1]))
+
+    def cell_of(p):
+        cx = np.minimum(np.maximum(p[:, 0] / cell_x, 0).astype(np.intp), cells - 1)
+        cy = np.minimum(np.maximum(p[:, 1] / cell_y, 0).astype(np.intp), cells - 1)
+        return cy * cells + cx
+
+    segments = []
+    min_segments = int(0.1 * cells / 0.5)  # como minlength=0.1 de streamplot
+    next_id = 0
+    for stride in strides:
+        # Semillas en los centros de celdas libres, de grueso a fino
+        cy, cx = np.mgrid[stride // 2:cells:stride, stride // 2:cells:stride]
+        seeds = np.column_stack([((cx + 0.5) * cell_x).ravel(), ((cy + 0.5) * cell_y).ravel()])
+        seeds = seeds[occupied[cell_of(seeds)] < 0]
+        if len(seeds) == 0:
+            continue
+        line_id = next_id + np.arange(len(seeds))
+        next_id += len(seeds)
+        occupied[cell_of(seeds)] = line_id
+
+        # Hacia adelante y hacia atrás a la vez
+        p = np.vstack([seeds, seeds])
+        owner = np.concatenate([line_id, line_id])
+        sign = np.repeat([h, -h], len(seeds))[:, None]
+        alive = np.arange(len(p))
+        steps = []
+        for _ in range(max_steps):
+            q = p[alive]
+            s = sign[alive]
+            k1 = sample(q)
+            k2 = sample(q + 0.5 * s * k1)
+            new = q + s * k2
+            # Fuera de la malla, campo nulo o cruce de una carga (la dirección se invierte)
+            ok = ((new[:, 0] >= 0) & (new[:, 0] <= nx - 1) & (new[:, 1] >= 0) & (new[:, 1] <= ny - 1)
+                  & (np.sum(k1 * k2, axis=1) > 0))
+            cell = cell_of(new)
+            ok &= (occupied[cell] < 0) | (occupied[cell] == owner[alive])
+            alive = alive[ok]
+            steps.append((np.stack([q[ok], new[ok]], axis=1), owner[alive]))
+            if len(alive) == 0:
+                break
+            occupied[cell[ok]] = owner[alive]
+            p[alive] = new[ok]
+
+        # Las líneas demasiado cortas se descartan y liberan sus celdas
+        step_owner = np.concatenate([o for _, o in steps])
+        count = np.bincount(step_owner - line_id[0], minlength=len(line_id))
+        short = line_id[count < min_segments]
+        occupied[np.isin(occupied, short)] = -1
+        keep = ~np.isin(step_owner, short)
+        segments.append(np.concatenate([segment for segment, _ in steps])[keep])
+
+    segments = np.concatenate(segments) if segments else np.zeros((0, 2, 2))
+    # |E| en el punto de la malla más cercano al centro de cada segmento
+    middle = np.rint(segments.mean(axis=1)).astype(np.intp)
+    color = magnitude[middle[:, 1], middle[:, 0]]
+    segments[..., 0] = x[0] + segments[..., 0] * dx
+    segments[..., 1] = y[0] + segments[..., 1] * dy
+    return segments, color
+
+class FastFieldRenderer:
+    def __init__(
+            self,
+            ax,
+            x: np.ndarray,
+            y: np.ndarray,
+            density: float = 1.5,
+            levels: int = 20,
+            trace_resolution: int = 256,
+            ):
+        """
+        Dibuja V como imagen (con equipotenciales) y las líneas de campo en ax.
+        Las llamadas sucesivas a draw reutilizan los artistas, así que sirve
+        para animaciones sobre la misma malla.
+
+        Args:
+            ax: Ejes de matplotlib.
+            x (np.ndarray): Coordenadas x (equiespaciadas).
+            y (np.ndarray): Coordenadas y (equiespaciadas).
+            density (float): Densidad de líneas de campo (como en streamplot).
+            levels (int): Número de equipotenciales.
+            trace_resolution (int): Puntos por lado de la malla (submuestreada)
+                                    sobre la que se trazan las líneas de campo.
+        """
+        self.ax = ax
+        self.x = x
+        self.y = y
+        self.density = density
+        self.levels = levels
+        _grid_step(x), _grid_step(y)  # valida que los ejes sean equiespaciados
+        self.stride = max(1, -(-max(len(x), len(y)) // trace_resolution))
+        self.image = None
+        self.lines = None
+
+    def draw(self, V: np.ndarray) -> TwoSlopeNorm:
+        """
+        Rasteriza V y traza las líneas de campo de -∇V.
+
+        Returns:
+            TwoSlopeNorm: Normalización usada para el potencial (para la barra de colores).
+        """
+        norm = TwoSlopeNorm(vmin=min(V.min(), -1e-300), vcenter=0, vmax=max(V.max(), 1e-300))
+
+        # La imagen se rasteriza a la resolución de los ejes en pantalla (más
+        # puntos no se verían y las equipotenciales quedan de un píxel)
+        window = self.ax.get_window_extent()
+        s = max(1, min(int(len(self.x) // max(window.width, 1)), int(len(self.y) // max(window.height, 1))))
+        xs, ys = self.x[::s], self.y[::s]
+        image = rasterize_potential(V[::s, ::s], norm.vmin, norm.vcenter, norm.vmax, levels=self.levels)
+        dx, dy = _grid_step(xs), _grid_step(ys)
+        extent = (xs[0] - dx / 2, xs[-1] + dx / 2, ys[0] - dy / 2, ys[-1] + dy / 2)
+
+        # Las líneas de campo no necesitan toda la resolución de la imagen
+        s = self.stride
+        xs, ys = self.x[::s], self.y[::s]
+        Ey, Ex = np.gradient(-V[::s, ::s], _grid_step(ys), _grid_step(xs))
+        segments, magnitude = trace_field_lines(Ex, Ey, xs, ys, density=self.density)
+
+        if self.image is None:
+            self.image = self.ax.imshow(image, origin='lower', extent=extent, interpolation='nearest')
+            self.lines = LineCollection(segments, cmap='viridis', linewidths=0.7)
+            self.ax.add_collection(self.lines)
+        else:
+            self.image.set_data(image)
+            self.image.set_extent(extent)
+            self.lines.set_segments(segments)
+        self.lines.set_array(magnitude)
+        self.lines.autoscale()
+        return norm
+
+def plot_field(
+        charge_list: Charge,
+        x: np.ndarray,
+        y: np.ndarray,
+        symmetries="auto",
+        renderer: str = "contour",
+        ) -> None:
+    """
+    Grafica el potencial (colores y equipotenciales) y las líneas de campo.
+
+    Args:
+        charge_list (list): Objetos Charge.
+        x (np.ndarray): Coordenadas x de la malla.
+        y (np.ndarray): Coordenadas y de la malla.
+        symmetries: "auto" para detectarlas, o lista de pares (nombre, paridad).
+        renderer (str): "contour" (contourf + streamplot) o "fast" (imagen
+                        rasterizada y trazador vectorizado; ejes equiespaciados).
+    """
+    [X, Y] = np.meshgrid(x, y)
+
+    # Solo se evalúa el dominio fundamental si la escena es simétrica
+    V = symmetric_potential(charge_list, x, y, symmetries)
 
     # Figura
     fig, ax = plt.subplots(figsize=(8, 6))
 
-    # Potencial como mapa de colores
-    norm = TwoSlopeNorm(vmin=V.min(), vcenter=0, vmax=V.max())
-    cf = ax.contourf(X, Y, V, levels=100, cmap='RdBu_r', norm=norm)
-    cbar = plt.colorbar(cf, ax=ax, label='Potencial eléctrico (V)')
+    if renderer == "fast":
+        # Imagen RGBA con equipotenciales y líneas de campo trazadas en bloque
+        norm = FastFieldRenderer(ax, x, y, density=1.5).draw(V)
+        cf = plt.cm.ScalarMappable(norm=norm, cmap='RdBu_r')
+        cbar = plt.colorbar(cf, ax=ax, label='Potencial eléctrico (V)')
+    elif renderer == "contour":
+        Ey, Ex = np.gradient(-V, y, x)
 
-    # Equipotenciales en blanco
-    ax.contour(X, Y, V, levels=20, colors='white', linewidths=0.5)
+        # Potencial como mapa de colores
+        norm = TwoSlopeNorm(vmin=V.min(), vcenter=0, vmax=V.max())
+        cf = ax.contourf(X, Y, V, levels=100, cmap='RdBu_r', norm=norm)
+        cbar = plt.colorbar(cf, ax=ax, label='Potencial eléctrico (V)')
 
-    # Líneas de campo eléctrico
-    magnitude = np.sqrt(Ex**2 + Ey**2)
-    ax.streamplot(X, Y, Ex, Ey, color=magnitude, linewidth=0.7, cmap='viridis', density=1.5)
+        # Equipotenciales en blanco
+        ax.contour(X, Y, V, levels=20, colors='white', linewidths=0.5)
+
+        # Líneas de campo eléctrico
+        magnitude = np.sqrt(Ex**2 + Ey**2)
+        ax.streamplot(X, Y, Ex, Ey, color=magnitude, linewidth=0.7, cmap='viridis', density=1.5)
+    else:
+        raise ValueError("renderer debe ser 'contour' o 'fast'.")
 
     # Carga lineal dibujada sobre el gráfico
     for Q in charge_list:
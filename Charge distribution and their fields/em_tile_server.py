@@ -0,0 +1,230 @@
+import io
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import matplotlib.pyplot as plt
+from em_geometry_2d import ke
+
+""" Servidor local de teselas (tiles) del potencial y del campo eléctrico.
+
+    La escena se recorre como un mapa: cada nivel de zoom divide el plano en
+    teselas cuadradas de tile_pixels x tile_pixels puntos. Las teselas se
+    calculan bajo demanda en un grupo de hilos y se guardan en una caché LRU
+    indexada por (hash de la escena, zoom, tx, ty); al desplazarse o acercarse
+    solo se calculan las regiones nuevas.
+
+    Rutas:
+        GET /scene                    -> JSON con el hash y la geometría de las teselas
+        GET /tiles/<zoom>/<tx>/<ty>.png -> potencial coloreado
+        GET /tiles/<zoom>/<tx>/<ty>.npz -> arreglos V, Ex, Ey comprimidos
+"""
+
+
+class TileCache:
+    def __init__(self, max_tiles: int = 512):
+        """ Caché LRU de teselas (arreglos y bytes codificados), segura entre hilos. """
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._tiles:
+                return None
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+
+    def put(self, key, tile) -> None:
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+
+    def __len__(self):
+        return len(self._tiles)
+
+
+class FieldTileServer:
+    # Zoom máximo: 2**40 teselas por lado ya es un paso subatómico con base_size ~ 1 m
+    max_zoom = 40
+
+    def __init__(
+            self,
+            charge_list: list,
+            origin: np.array = np.array([0, 0]),
+            base_size: float = 8.0,
+            tile_pixels: int = 256,
+            cache_size: int = 512,
+            workers: int = 4,
+            ):
+        """
+        Args:
+            charge_list (list): Objetos Charge de em_geometry_2d.
+            origin (np.array): Esquina inferior izquierda de la tesela (0, 0).
+            base_size (float): Lado (m) de una tesela en el zoom 0.
+            tile_pixels (int): Puntos por lado de cada tesela.
+            cache_size (int): Número máximo de teselas en la caché.
+            workers (int): Hilos que calculan teselas.
+        """
+        self.charge_list = charge_list
+        self.origin = np.asarray(origin, dtype=float)
+        self.base_size = base_size
+        self.tile_pixels = tile_pixels
+        self.cache = TileCache(cache_size)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        # Escala de color común a todas las teselas (potencial típico de la escena)
+        total = sum(np.sum(np.abs(Q.DeltaQ)) for Q in charge_list)
+        self.color_scale = ke * total / base_size if total > 0 else 1.0
+
+    @property
+    def scene_hash(self) -> str:
+        """ Hash de las muestras y cargas de la escena (cambia si la escena cambia). """
+        digest = hashlib.sha1()
+        for Q in self.charge_list:
+            for array in (Q.x, Q.y, Q.DeltaQ):
+                digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+        return digest.hexdigest()
+
+    def tile_bounds(self, zoom: int, tx: int, ty: int) -> tuple:
+        """ Límites (xmin, xmax, ymin, ymax) de una tesela. """
+        if not 0 <= zoom <= self.max_zoom:
+            raise ValueError(f"Zoom fuera de rango: use 0 <= zoom <= {self.max_zoom}.")
+        size = self.base_size / 2**zoom
+        x0 = self.origin[0] + tx * size
+        y0 = self.origin[1] + ty * size
+        return x0, x0 + size, y0, y0 + size
+
+    def compute_tile(self, zoom: int, tx: int, ty: int) -> dict:
+        """
+        Calcula V, Ex y Ey en los centros de los puntos de una tesela.
+
+        Returns:
+            dict: Arreglos (tile_pixels, tile_pixels) con filas en y creciente.
+        """
+        xmin, xmax, ymin, ymax = self.tile_bounds(zoom, tx, ty)
+        n = self.tile_pixels
+        h = (xmax - xmin) / n
+        # Un punto extra por lado para que el gradiente sea centrado en los bordes
+        x = xmin + h * (np.arange(-1, n + 1) + 0.5)
+        y = ymin + h * (np.arange(-1, n + 1) + 0.5)
+        [X, Y] = np.meshgrid(x, y)
+        V = np.zeros_like(X)
+        for Q in self.charge_list:
+            V = V + Q.potential(X, Y)
+        Ey, Ex = np.gradient(-V, y, x)
+        return {"V": V[1:-1, 1:-1], "Ex": Ex[1:-1, 1:-1], "Ey": Ey[1:-1, 1:-1]}
+
+    def get_tile(self, zoom: int, tx: int, ty: int) -> dict:
+        """ Devuelve una tesela desde la caché o la calcula en el grupo de hilos. """
+        key = (self.scene_hash, zoom, tx, ty)
+        tile = self.cache.get(key)
+        if tile is not None:
+            return tile
+        # Peticiones simultáneas de la misma tesela comparten el cálculo
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self.pool.submit(self.compute_tile, zoom, tx, ty)
+                self._pending[key] = future
+        try:
+            tile = future.result()
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+        self.cache.put(key, tile)
+        return tile
+
+    def encode(self, tile: dict, fmt: str) -> tuple:
+        """ Codifica una tesela como PNG o NPZ comprimido; devuelve (bytes, tipo MIME). """
+        buffer = io.BytesIO()
+        if fmt == "png":
+            # Mapa de colores simétrico y común a todas las teselas (filas de arriba hacia abajo)
+            image = np.tanh(tile["V"] / self.color_scale)[::-1]
+            plt.imsave(buffer, image, cmap="RdBu_r", vmin=-1, vmax=1, format="png")
+            return buffer.getvalue(), "image/png"
+        elif fmt == "npz":
+            np.savez_compressed(buffer, **tile)
+            return buffer.getvalue(), "application/octet-stream"
+        raise ValueError("Formato desconocido: use png o npz.")
+
+    def get_encoded(self, zoom: int, tx: int, ty: int, fmt: str) -> tuple:
+        """ Tesela ya codificada; los bytes también quedan en la caché. """
+        if fmt not in ("png", "npz"):
+            raise ValueError("Formato desconocido: use png o npz.")
+        key = (self.scene_hash, zoom, tx, ty, fmt)
+        encoded = self.cache.get(key)
+        if encoded is None:
+            encoded = self.encode(self.get_tile(zoom, tx, ty), fmt)
+            self.cache.put(key, encoded)
+        return encoded
+
+    def describe(self) -> dict:
+        return {
+            "scene_hash": self.scene_hash,
+            "origin": self.origin.tolist(),
+            "base_size": self.base_size,
+            "tile_pixels": self.tile_pixels,
+            "cached_entries": len(self.cache),
+        }
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                try:
+                    if parts == ["scene"]:
+                        body = json.dumps(server.describe()).encode()
+                        self._reply(200, body, "application/json")
+                        return
+                    if len(parts) == 4 and parts[0] == "tiles":
+                        ty, fmt = parts[3].split(".")
+                        self._reply(200, *server.get_encoded(int(parts[1]), int(parts[2]), int(ty), fmt))
+                        return
+                except (ValueError, OverflowError) as error:  # p. ej. tx, ty enormes
+                    self._reply(400, str(error).encode(), "text/plain")
+                    return
+                self._reply(404, b"Ruta desconocida", "text/plain")
+
+            def _reply(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """ Atiende peticiones hasta que se interrumpa (Ctrl+C). """
+        httpd = ThreadingHTTPServer((host, port), self.make_handler())
+        print(f"Sirviendo teselas en http://{host}:{port}/tiles/<zoom>/<tx>/<ty>.png")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+            self.pool.shutdown()
+
+# TEST ROOM:
+if __name__ == "__main__":
+    from em_geometry_2d import Circle
+
+    charge_list = []
+    charge_list.append(Circle(charge=+1, radius=1, center=[0,0], number_of_samples=128))
+    charge_list.append(Circle(charge=-1, radius=2, center=[0,0], number_of_samples=128))
+
+    FieldTileServer(charge_list, origin=[-4, -4], base_size=8).serve()
@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from em_conductors_2d import ConductorSystem
 from em_geometry_2d import Circle, plot_field
 
 charge_list = []
@@ -8,6 +9,12 @@ charge_list = []
 charge_list.append(Circle(charge=+1, radius=1, center=[0,0], number_of_samples=128))
 charge_list.append(Circle(charge=-1, radius=2, center=[0,0], number_of_samples=128))
 
+# Conductores: redistribuir la carga de cada objeto para que sea equipotencial
+# (con False, la carga queda repartida uniformemente entre las muestras)
+conductors = True
+if conductors:
+    ConductorSystem(charge_list).solve()
+
 xlim = 3
 ylim = 3
 
@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from em_conductors_2d import ConductorSystem
 from em_geometry_2d import Line2, plot_field
 
 charge_list = []
@@ -7,6 +8,12 @@ charge_list = []
 charge_list.append(Line2(charge=+1, pos1=[-0.1, -0.4], pos2=[-0.1, +0.4]))
 charge_list.append(Line2(charge=-1, pos1=[+0.1, -0.4], pos2=[+0.1, +0.4]))
 
+# Conductores: redistribuir la carga de cada objeto para que sea equipotencial
+# (con False, la carga queda repartida uniformemente entre las muestras)
+conductors = True
+if conductors:
+    ConductorSystem(charge_list).solve()
+
 xlim = 0.5
 ylim = 0.6
 
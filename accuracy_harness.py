@@ -0,0 +1,639 @@
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+from scipy.constants import epsilon_0, mu_0, pi
+import utils
+import ewald
+import symmetry
+import chunked_field
+import magnetostatics
+# El paquete 2D se ejecuta desde su propia carpeta: se importa por ruta
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Charge distribution and their fields"))
+import em_geometry_2d
+import em_conductors_2d
+""" Banco de precisión: campos calculados contra soluciones analíticas.
+
+    Cada caso tiene una referencia cerrada (carga puntual, línea infinita,
+    esfera uniformemente cargada, anillo sobre su eje y segmento finito) y
+    se evalúa con todos los modos disponibles (suma directa, float32,
+    expansión multipolar, simetrías, axisimetría, Ewald, ladrillos...).
+    Los modos multipolares se miden también en mallas más allá del radio
+    seguro, e informan qué fracción de los puntos evaluó la expansión.
+
+    El paquete 2D ("Charge distribution and their fields") tiene sus propios
+    casos: potencial de em_geometry_2d (con y sin expansión, y con
+    symmetric_potential), conductores de em_conductors_2d y el trazado de
+    líneas de FastFieldRenderer.
+
+    Para cada modo se informa el error máximo y RMS relativos junto con el
+    tiempo de cálculo, y cada modo tiene un presupuesto de error máximo: si
+    alguna fila lo supera, el script termina con código distinto de cero.
+    Al agregar un modo nuevo basta con sumarlo (con su presupuesto) a la
+    lista del caso.
+"""
+# Atajos:
+O = np.array([0, 0, 0])
+ke = 1 / (4 * pi * epsilon_0)
+km = mu_0 / (4 * pi)
+
+
+# 1) Referencias analíticas
+def point_charge_reference(q: float, position: np.array, X, Y, Z) -> dict:
+    """ Campo y potencial de una carga puntual. """
+    Rx, Ry, Rz = X - position[0], Y - position[1], Z - position[2]
+    R = np.sqrt(Rx**2 + Ry**2 + Rz**2)
+    return {"E": [ke * q * Rx / R**3, ke * q * Ry / R**3, ke * q * Rz / R**3], "V": ke * q / R}
+
+
+def infinite_line_reference(charge_density: float, X, Y, Z) -> dict:
+    """ Campo de una línea infinita sobre el eje z: E = λ / (2π ε0 ρ) en dirección radial. """
+    rho_squared = X**2 + Y**2
+    factor = charge_density / (2 * pi * epsilon_0 * rho_squared)
+    return {"E": [factor * X, factor * Y, np.zeros_like(Z)]}
+
+
+def charged_sphere_reference(total_charge: float, radius: float, X, Y, Z) -> dict:
+    """ Cáscara esférica centrada en el origen: E = 0 dentro y kQ/r² fuera. """
+    r = np.sqrt(X**2 + Y**2 + Z**2)
+    inside = r < radius
+    factor = np.where(inside, 0, ke * total_charge / r**3)
+    V = np.where(inside, ke * total_charge / radius, ke * total_charge / r)
+    return {"E": [factor * X, factor * Y, factor * Z], "V": V}
+
+
+def ring_axis_reference(total_charge: float, radius: float, Z) -> dict:
+    """ Anillo en el plano z = 0, centrado en el origen, evaluado sobre el eje z. """
+    r_squared = Z**2 + radius**2
+    zero = np.zeros_like(Z)
+    return {"E": [zero, zero, ke * total_charge * Z / r_squared**1.5],
+            "V": ke * total_charge / np.sqrt(r_squared)}
+
+
+def current_loop_axis_reference(current: float, radius: float, Z) -> dict:
+    """ Espira en el plano z = 0 sobre su eje: B = μ0 I a² / (2 (z² + a²)^(3/2)). """
+    zero = np.zeros_like(Z)
+    return {"B": [zero, zero, mu_0 * current * radius**2 / (2 * (Z**2 + radius**2)**1.5)]}
+
+
+def _segment_frame(pos1, pos2, X, Y, Z):
+    """ Distancia d a la recta, dirección n hacia el punto y coordenadas s1, s2 de los extremos. """
+    pos1 = np.asarray(pos1, dtype=float)
+    pos2 = np.asarray(pos2, dtype=float)
+    t = (pos2 - pos1) / np.linalg.norm(pos2 - pos1)
+    P = np.stack([X, Y, Z])
+    A = pos1.reshape((3,) + (1,) * X.ndim)
+    along = np.tensordot(t, P - A, axes=(0, 0))
+    perpendicular = P - A - t.reshape(A.shape) * along
+    d = np.sqrt(np.sum(perpendicular**2, axis=0))
+    n = perpendicular / d
+    s1 = -along
+    s2 = np.linalg.norm(pos2 - pos1) - along
+    return t, n, d, s1, s2
+
+
+def finite_segment_reference(total_charge: float, pos1: np.array, pos2: np.array, X, Y, Z) -> dict:
+    """
+    Segmento uniformemente cargado:
+        E⊥ = kλ/d (s2/r2 - s1/r1),  E∥ = kλ (1/r1 - 1/r2),  V = kλ ln((s2 + r2) / (s1 + r1))
+    """
+    t, n, d, s1, s2 = _segment_frame(pos1, pos2, X, Y, Z)
+    charge_density = total_charge / np.linalg.norm(np.asarray(pos2, dtype=float) - pos1)
+    r1 = np.sqrt(d**2 + s1**2)
+    r2 = np.sqrt(d**2 + s2**2)
+    E_perpendicular = ke * charge_density / d * (s2 / r2 - s1 / r1)
+    E_parallel = ke * charge_density * (1 / r1 - 1 / r2)
+    E = [E_perpendicular * n[i] - E_parallel * t[i] for i in range(3)]
+    return {"E": E, "V": ke * charge_density * np.log((s2 + r2) / (s1 + r1))}
+
+
+def current_segment_reference(current: float, pos1: np.array, pos2: np.array, X, Y, Z) -> dict:
+    """ Tramo recto de corriente: B = μ0 I / (4π d) (s2/r2 - s1/r1) en dirección t × n. """
+    t, n, d, s1, s2 = _segment_frame(pos1, pos2, X, Y, Z)
+    magnitude = km * current / d * (s2 / np.sqrt(d**2 + s2**2) - s1 / np.sqrt(d**2 + s1**2))
+    direction = np.cross(t, n, axis=0)
+    return {"B": [magnitude * direction[i] for i in range(3)]}
+
+
+# 2) Fuentes discretizadas
+def segment_charges(total_charge: float, pos1: np.array, pos2: np.array, number_of_samples: int) -> list:
+    """ Segmento como cargas puntuales en los puntos medios de tramos iguales. """
+    t = (np.arange(number_of_samples) + 0.5) / number_of_samples
+    points = np.outer(1 - t, pos1) + np.outer(t, pos2)
+    return [utils.PointCharge(total_charge / number_of_samples, p) for p in points]
+
+
+def ring_charges(total_charge: float, radius: float, number_of_samples: int) -> list:
+    """ Anillo en el plano z = 0 como cargas puntuales equiespaciadas. """
+    theta = 2 * pi * (np.arange(number_of_samples) + 0.5) / number_of_samples
+    return [utils.PointCharge(total_charge / number_of_samples, np.array([radius * np.cos(a), radius * np.sin(a), 0.0]))
+            for a in theta]
+
+
+def sphere_charges(total_charge: float, radius: float, samples_theta: int = 48, samples_phi: int = 24) -> list:
+    """
+    Cáscara esférica con cuadratura de producto: Gauss-Legendre en cos(φ) y
+    puntos medios en θ. Integra exactamente los armónicos hasta grado
+    min(2 samples_phi - 1, samples_theta - 1) y es simétrica respecto a los
+    planos x = 0, y = 0 y z = 0.
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(samples_phi)
+    theta = 2 * pi * (np.arange(samples_theta) + 0.5) / samples_theta
+    charge_list = []
+    for cos_phi, w in zip(nodes, weights):
+        sin_phi = np.sqrt(1 - cos_phi**2)
+        for a in theta:
+            position = radius * np.array([sin_phi * np.cos(a), sin_phi * np.sin(a), cos_phi])
+            charge_list.append(utils.PointCharge(total_charge * w / (2 * samples_theta), position))
+    return charge_list
+
+
+def script_sphere_charges(total_charge: float, radius: float, samples_theta: int = 50, samples_phi: int = 30) -> list:
+    """ El muestreo de '2025-06-27 electrostatic spherical shell.py' (θ y φ con np.linspace). """
+    surface_charge_density = total_charge / (4 * pi * radius**2)
+    delta_theta = 2 * pi / samples_theta
+    delta_phi = pi / samples_phi
+    charge_list = []
+    for theta in np.linspace(0, 2 * pi, samples_theta):
+        for phi in np.linspace(0, pi, samples_phi):
+            position = radius * np.array([np.sin(phi) * np.cos(theta), np.sin(phi) * np.sin(theta), np.cos(phi)])
+            magnitude = surface_charge_density * radius**2 * np.sin(phi) * delta_phi * delta_theta
+            charge_list.append(utils.PointCharge(magnitude, position))
+    return charge_list
+
+
+# 3) Modos de evaluación (devuelven un dict con "E", "V" y/o "B")
+def direct(charge_list: list, dtype: type = np.float64, potential: bool = True):
+    """ Suma directa, acumulando cada fuente en buffers del dtype pedido. """
+    def evaluate(x_space, y_space, z_space):
+        X, Y, Z = [A.astype(dtype) for A in np.meshgrid(x_space, y_space, z_space)]
+        E = [np.zeros_like(X), np.zeros_like(X), np.zeros_like(X)]
+        V = np.zeros_like(X)
+        workspace = utils.Workspace()
+        for charge in charge_list:
+            charge.accumulate_electric_field(X, Y, Z, *E, workspace)
+            if potential:
+                charge.accumulate_electric_potential(X, Y, Z, V, workspace)
+        return {"E": E, "V": V} if potential else {"E": E}
+    return evaluate
+
+
+def magnetic(current_list: list):
+    """ Suma directa de magnetic_field de cada corriente. """
+    def evaluate(x_space, y_space, z_space):
+        X, Y, Z = np.meshgrid(x_space, y_space, z_space)
+        B = [np.zeros_like(X), np.zeros_like(X), np.zeros_like(X)]
+        for current in current_list:
+            B_differential = current.magnetic_field(X, Y, Z)
+            for i in range(3):
+                B[i] += B_differential[i]
+        return {"B": B}
+    return evaluate
+
+
+def symmetric(charge_list: list):
+    """ symmetry.symmetric_electric_field / _potential con simetrías detectadas. """
+    def evaluate(x_space, y_space, z_space):
+        return {"E": symmetry.symmetric_electric_field(charge_list, x_space, y_space, z_space),
+                "V": symmetry.symmetric_electric_potential(charge_list, x_space, y_space, z_space)}
+    return evaluate
+
+
+def axisymmetric(charge_list: list):
+    """ symmetry.axisymmetric_field con eje z por el origen. """
+    def evaluate(x_space, y_space, z_space):
+        X, Y, Z = np.meshgrid(x_space, y_space, z_space)
+        E, V = symmetry.axisymmetric_field(charge_list, X, Y, Z)
+        return {"E": E, "V": V}
+    return evaluate
+
+
+def axisymmetric_about_x(charge_list: list, x_space, y_space, z_space, samples: tuple = None) -> dict:
+    """ symmetry.axisymmetric_field con el eje x como eje de simetría. """
+    X, Y, Z = np.meshgrid(x_space, y_space, z_space)
+    E, V = symmetry.axisymmetric_field(charge_list, X, Y, Z, axis_direction=[1, 0, 0], samples=samples)
+    return {"E": E, "V": V}
+
+
+def chunked(charge_list: list, brick_size: int = 8):
+    """ chunked_field.ChunkedField en una carpeta temporal. """
+    def evaluate(x_space, y_space, z_space):
+        with tempfile.TemporaryDirectory() as directory:
+            field = chunked_field.ChunkedField(directory, x_space, y_space, z_space, brick_size=brick_size)
+            field.compute(charge_list)
+            result = {"E": [np.array(field.arrays[name]) for name in ("Ex", "Ey", "Ez")],
+                      "V": np.array(field.arrays["V"])}
+            del field
+        return result
+    return evaluate
+
+
+def far_fraction(distribution: utils.ChargeDistribution, X, Y, Z) -> float:
+    """ Fracción de los puntos que la distribución evalúa con la expansión multipolar. """
+    if not distribution.uses_multipole(3):
+        return 0.0
+    R_squared = (X - distribution.position[0])**2 + (Y - distribution.position[1])**2 + (Z - distribution.position[2])**2
+    return np.mean(R_squared > max(distribution.safe_radius**2, 1e-4))
+
+
+def multipolar(distribution: utils.ChargeDistribution):
+    """ Suma directa de una ChargeDistribution, informando la fracción de puntos lejanos. """
+    evaluate_direct = direct([distribution])
+    def evaluate(x_space, y_space, z_space):
+        result = evaluate_direct(x_space, y_space, z_space)
+        result["far"] = far_fraction(distribution, *np.meshgrid(x_space, y_space, z_space))
+        return result
+    return evaluate
+
+
+def potential_2d(charge_list: list):
+    """ Suma de Charge.potential de em_geometry_2d, con la fracción de puntos lejanos. """
+    def evaluate(x_space, y_space):
+        X, Y = np.meshgrid(x_space, y_space)
+        V = np.zeros(X.shape)
+        far = np.zeros(X.shape)
+        for Q in charge_list:
+            V = V + Q.potential(X, Y)
+            center, safe_radius, _ = Q.multipole()
+            far += (X - center[0])**2 + (Y - center[1])**2 > max(safe_radius**2, 1e-4)
+        return {"V": V, "far": np.mean(far) / len(charge_list)}
+    return evaluate
+
+
+def symmetric_2d(charge_list: list):
+    """ em_geometry_2d.symmetric_potential con simetrías detectadas. """
+    def evaluate(x_space, y_space):
+        return {"V": em_geometry_2d.symmetric_potential(charge_list, x_space, y_space)}
+    return evaluate
+
+
+# 4) Comparación
+def compare(computed, reference, mask: np.ndarray) -> tuple:
+    """
+    Errores relativos en los puntos de 'mask'.
+
+    Returns:
+        tuple: (max |F - F_ref| / max |F_ref|, RMS |F - F_ref| / RMS |F_ref|)
+    """
+    if isinstance(reference, (list, tuple)):
+        error = np.sqrt(sum((np.asarray(c, dtype=float) - r)**2 for c, r in zip(computed, reference)))
+        size = np.sqrt(sum(r**2 for r in reference))
+    else:
+        error = np.abs(np.asarray(computed, dtype=float) - reference)
+        size = np.abs(reference)
+    error, size = error[mask], size[mask]
+    scale = size.max() if size.max() != 0 else 1e-20  # evitar división por cero
+    rms_scale = np.sqrt(np.mean(size**2))
+    rms_scale = rms_scale if rms_scale != 0 else 1e-20
+    return error.max() / scale, np.sqrt(np.mean(error**2)) / rms_scale
+
+
+def _row(case: str, mode: str, quantity: str, computed, reference, mask: np.ndarray,
+         seconds: float, budget: float, far: float = None) -> dict:
+    """ Fila del informe: error relativo, costo y si el error cabe en el presupuesto. """
+    max_error, rms_error = compare(computed, reference, mask)
+    return {
+        "case": case,
+        "mode": mode,
+        "quantity": quantity,
+        "points": mask.size,
+        "far": far,
+        "max_error": max_error,
+        "rms_error": rms_error,
+        "seconds": seconds,
+        "budget": budget,
+        "passed": bool(max_error <= budget),
+    }
+
+
+def measure(case: str, modes: list, spaces: tuple, reference: dict, mask: np.ndarray, repeat: int = 3) -> list:
+    """
+    Evalúa cada modo (el mejor tiempo de 'repeat' corridas) y lo compara con la referencia.
+
+    Args:
+        case (str): Nombre del caso.
+        modes (list): Tríos (nombre, evaluate(*spaces), presupuesto del error
+                      máximo relativo). Si evaluate devuelve también "far",
+                      se informa como fracción de puntos lejanos.
+        spaces (tuple): Coordenadas de la malla, p. ej. (x_space, y_space, z_space).
+        reference (dict): Cantidades analíticas ("E", "V", "B") en la malla.
+        mask (np.ndarray): Puntos donde se mide el error (lejos de las fuentes);
+                           el costo se reparte entre todos los puntos de la malla.
+        repeat (int): Número de corridas cronometradas por modo.
+
+    Returns:
+        list: Un dict por (modo, cantidad) con el error y el costo.
+    """
+    rows = []
+    for mode, evaluate, budget in modes:
+        seconds = np.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = evaluate(*spaces)
+            seconds = min(seconds, time.perf_counter() - start)
+        far = result.pop("far", None)
+        for quantity, computed in result.items():
+            if quantity not in reference:
+                continue
+            rows.append(_row(case, mode, quantity, computed, reference[quantity], mask, seconds, budget, far))
+    return rows
+
+
+# 5) Casos
+def _cube(points: int = 24, size: float = 2.0) -> tuple:
+    """ Malla cúbica simétrica; con un número par de puntos no incluye el origen. """
+    space = np.linspace(-size, size, points)
+    return space, space.copy(), space.copy()
+
+
+def point_charge_case(repeat: int = 3) -> list:
+    q = 1e-9
+    spaces = _cube()
+    X, Y, Z = np.meshgrid(*spaces)
+    charge = utils.PointCharge(q, np.array([0.0, 0.0, 0.0]))
+    modes = [
+        ("directo", direct([charge]), 1e-13),
+        ("float32", direct([charge], dtype=np.float32), 1e-5),
+        # Una sola carga: la expansión no compensa y todos los puntos son directos
+        ("multipolar", multipolar(utils.ChargeDistribution([charge])), 1e-13),
+        ("simetría", symmetric([charge]), 1e-13),
+        ("ladrillos", chunked([charge]), 1e-13),
+    ]
+    return measure("carga puntual", modes, spaces, point_charge_reference(q, O, X, Y, Z),
+                   np.ones(X.shape, dtype=bool), repeat)
+
+
+def infinite_line_case(repeat: int = 3) -> list:
+    charge_density = 1e-9
+    spacing = 0.05
+    spaces = _cube()
+    X, Y, Z = np.meshgrid(*spaces)
+    line = utils.InfiniteLineCharge(charge_density, np.array([0.0, 0.0, 0.0]), np.array([0, 0, 1]))
+    # Cadena periódica de cargas: igual a la línea salvo términos ~ exp(-2π ρ / a)
+    chain = ewald.PeriodicLattice([utils.PointCharge(charge_density * spacing, O)], [[0, 0, spacing]])
+    modes = [
+        ("directo", direct([line], potential=False), 1e-13),
+        ("float32", direct([line], dtype=np.float32, potential=False), 1e-5),
+        ("Ewald 1D (a = 0.05)", direct([chain], potential=False), 1e-5),
+        # La línea no tiene muestras: las simetrías se declaran
+        ("simetría (declarada)", lambda *s: {"E": symmetry.symmetric_electric_field(
+            [line], *s, symmetries=[("mirror_x", +1), ("mirror_y", +1), ("mirror_z", +1)])}, 1e-13),
+    ]
+    mask = X**2 + Y**2 > 4 * spacing**2
+    return measure("línea infinita", modes, spaces, infinite_line_reference(charge_density, X, Y, Z),
+                   mask, repeat)
+
+
+def charged_sphere_case(repeat: int = 3) -> list:
+    Q = 1e-9
+    radius = 1.0
+    spaces = _cube()
+    X, Y, Z = np.meshgrid(*spaces)
+    shell = utils.ChargeDistribution(sphere_charges(Q, radius))
+    script_shell = utils.ChargeDistribution(script_sphere_charges(Q, radius))
+    modes = [
+        ("directo (1152 cargas)", direct(shell.charge_list), 1e-6),
+        ("float32", direct(shell.charge_list, dtype=np.float32), 1e-5),
+        # Toda la malla está dentro del radio seguro (~21 radios): suma directa
+        ("multipolar", multipolar(shell), 1e-6),
+        ("simetría", symmetric([shell]), 1e-6),
+        ("axisimétrico", axisymmetric([shell]), 1e-4),
+        ("ladrillos", chunked([shell]), 1e-6),
+        ("muestreo del script (50x30)", direct([script_shell]), 1e-1),
+    ]
+    # Lejos de la superficie, donde la discretización de la cáscara no domina
+    r = np.sqrt(X**2 + Y**2 + Z**2)
+    mask = (r < 0.6 * radius) | (r > 1.4 * radius)
+    rows = measure("esfera cargada", modes, spaces, charged_sphere_reference(Q, radius, X, Y, Z), mask, repeat)
+
+    # Malla lejana: la mayoría de los puntos quedan fuera del radio seguro
+    spaces = _cube(size=40 * radius)
+    X, Y, Z = np.meshgrid(*spaces)
+    mask = np.ones(X.shape, dtype=bool)
+    rows += measure("esfera (lejos)", [("directo (1152 cargas)", direct(shell.charge_list), 1e-12)], spaces,
+                    charged_sphere_reference(Q, radius, X, Y, Z), mask, repeat)
+    # La expansión se mide contra la suma directa de las mismas muestras, sin
+    # el error de discretización, con un presupuesto cercano a su tolerancia
+    modes = [
+        ("multipolar (tol 1e-12)", multipolar(shell), 1e-11),
+        ("multipolar (tol 1e-6)", multipolar(utils.ChargeDistribution(shell.charge_list, tolerance=1e-6)), 1e-5),
+    ]
+    rows += measure("esfera (lejos)", modes, spaces, direct(shell.charge_list)(*spaces), mask, repeat)
+    return rows
+
+
+def ring_axis_case(repeat: int = 3) -> list:
+    Q = 1e-9
+    radius = 0.5
+    current = 1.0
+    # Sobre el eje, hasta ~60 radios: la expansión cubre los puntos lejanos
+    spaces = (np.array([0.0]), np.array([0.0]), np.linspace(-30, 30, 241))
+    X, Y, Z = np.meshgrid(*spaces)
+    ring = ring_charges(Q, radius, 512)
+    modes = [
+        ("directo (512 cargas)", direct(ring), 1e-13),
+        ("float32", direct(ring, dtype=np.float32), 1e-5),
+        ("simetría", symmetric(ring), 1e-13),
+    ]
+    mask = np.ones(X.shape, dtype=bool)
+    rows = measure("anillo (eje)", modes, spaces, ring_axis_reference(Q, radius, Z), mask, repeat)
+    # Expansión contra la suma directa de las muestras
+    modes = [
+        ("multipolar (tol 1e-12)", multipolar(utils.ChargeDistribution(ring)), 1e-11),
+        ("multipolar (tol 1e-6)", multipolar(utils.ChargeDistribution(ring, tolerance=1e-6)), 1e-5),
+        ("multipolar (tol 1e-3)", multipolar(utils.ChargeDistribution(ring, tolerance=1e-3)), 1e-2),
+    ]
+    rows += measure("anillo (eje)", modes, spaces, direct(ring)(*spaces), mask, repeat)
+
+    spaces = (np.array([0.0]), np.array([0.0]), np.linspace(-5, 5, 201))
+    X, Y, Z = np.meshgrid(*spaces)
+    polygon = lambda sides: np.array([[radius * np.cos(a), radius * np.sin(a), 0]
+                                      for a in np.linspace(0, 2 * pi, sides + 1)[:-1]])
+    modes = [
+        ("CurrentLoop (elíptica)", magnetic([magnetostatics.CurrentLoop(current, radius)]), 1e-13),
+        ("CurrentPath (64 lados)", magnetic([magnetostatics.CurrentPath(current, polygon(64), closed=True)]), 1e-2),
+        ("CurrentPath (1024 lados)", magnetic([magnetostatics.CurrentPath(current, polygon(1024), closed=True)]), 1e-4),
+    ]
+    rows += measure("espira (eje)", modes, spaces, current_loop_axis_reference(current, radius, Z),
+                    np.ones(X.shape, dtype=bool), repeat)
+    return rows
+
+
+def finite_segment_case(repeat: int = 3) -> list:
+    Q = 1e-9
+    current = 1.0
+    pos1 = np.array([-0.5, 0.0, 0.0])
+    pos2 = np.array([0.5, 0.0, 0.0])
+    spaces = _cube(size=1.5)
+    X, Y, Z = np.meshgrid(*spaces)
+    coarse = segment_charges(Q, pos1, pos2, 64)
+    fine = segment_charges(Q, pos1, pos2, 512)
+    modes = [
+        ("directo (64 cargas)", direct(coarse), 1e-3),
+        ("directo (512 cargas)", direct(fine), 1e-5),
+        ("float32 (512 cargas)", direct(fine, dtype=np.float32), 1e-5),
+        ("multipolar (512 cargas)", multipolar(utils.ChargeDistribution(fine)), 1e-5),
+        ("simetría (512 cargas)", symmetric(fine), 1e-5),
+        # Plano (r, z) de 256 x 256: con el muestreo por defecto la fila r = 0 cae
+        # sobre las cargas del eje y la interpolación pierde dos órdenes
+        ("axisimétrico (512 cargas)", lambda *s: axisymmetric_about_x(fine, *s, samples=(256, 256)), 1e-5),
+    ]
+    # Lejos de la recta y de los extremos, donde la discretización no domina
+    _, _, d, s1, s2 = _segment_frame(pos1, pos2, X, Y, Z)
+    mask = d > 0.2
+    rows = measure("segmento finito", modes, spaces, finite_segment_reference(Q, pos1, pos2, X, Y, Z), mask, repeat)
+
+    modes = [
+        ("CurrentSegment", magnetic([magnetostatics.CurrentSegment(current, pos1, pos2)]), 1e-13),
+        ("CurrentPath (8 tramos)", magnetic([magnetostatics.CurrentPath(current, np.linspace(pos1, pos2, 9))]), 1e-13),
+    ]
+    rows += measure("tramo de corriente", modes, spaces, current_segment_reference(current, pos1, pos2, X, Y, Z),
+                    mask, repeat)
+
+    # Malla lejana (radio seguro de ~11 veces el semilargo)
+    spaces = _cube(size=20)
+    X, Y, Z = np.meshgrid(*spaces)
+    mask = np.ones(X.shape, dtype=bool)
+    rows += measure("segmento (lejos)", [("directo (512 cargas)", direct(fine), 1e-6)], spaces,
+                    finite_segment_reference(Q, pos1, pos2, X, Y, Z), mask, repeat)
+    # Expansión contra la suma directa de las muestras (como en la esfera lejana)
+    modes = [
+        ("multipolar (tol 1e-12)", multipolar(utils.ChargeDistribution(fine)), 1e-11),
+        ("multipolar (tol 1e-6)", multipolar(utils.ChargeDistribution(fine, tolerance=1e-6)), 1e-5),
+    ]
+    rows += measure("segmento (lejos)", modes, spaces, direct(fine)(*spaces), mask, repeat)
+    return rows
+
+
+# 6) Casos del paquete 2D (em_geometry_2d, em_conductors_2d)
+def samples_potential_2d(charge_list: list, X, Y) -> np.ndarray:
+    """ Suma directa de referencia sobre las muestras (x, y, ΔQ) de los objetos 2D. """
+    V = np.zeros(np.shape(X))
+    for Q in charge_list:
+        for qk, xk, yk in zip(np.broadcast_to(Q.DeltaQ, np.shape(Q.x)), Q.x, Q.y):
+            V += ke * qk / np.sqrt((X - xk)**2 + (Y - yk)**2)
+    return V
+
+
+def point_charge_2d_case(repeat: int = 3) -> list:
+    q = 1e-9
+    # Malla de enteros: el potencial no debe truncarse al dtype de la malla
+    spaces = (np.arange(-64, 65), np.arange(-64, 65))
+    X, Y = np.meshgrid(*spaces)
+    charge_list = [em_geometry_2d.Point(q, [0, 0])]
+    modes = [
+        ("Charge.potential", potential_2d(charge_list), 1e-13),
+        ("symmetric_potential", symmetric_2d(charge_list), 1e-13),
+    ]
+    with np.errstate(divide="ignore", invalid="ignore"):  # la carga está en un nodo (fuera de la máscara)
+        reference = point_charge_reference(q, O, X.astype(float), Y.astype(float), np.zeros(X.shape))
+    return measure("carga puntual 2D", modes, spaces, reference, X**2 + Y**2 > 0, repeat)
+
+
+def circle_2d_case(repeat: int = 3) -> list:
+    Q = 1e-9
+    radius = 0.5
+    # Malla lejana: el radio seguro es ~11 radios a tol 1e-12 y ~2.3 a tol 1e-6
+    spaces = (np.linspace(-16, 16, 256), np.linspace(-16, 16, 256))
+    X, Y = np.meshgrid(*spaces)
+    circle = em_geometry_2d.Circle(Q, radius, [0, 0], 256)
+    coarse = em_geometry_2d.Circle(Q, radius, [0, 0], 256)
+    coarse.multipole_tolerance = 1e-6
+    modes = [
+        ("Charge.potential (tol 1e-12)", potential_2d([circle]), 1e-11),
+        ("Charge.potential (tol 1e-6)", potential_2d([coarse]), 1e-5),
+        ("symmetric_potential", symmetric_2d([circle]), 1e-11),
+    ]
+    reference = {"V": samples_potential_2d([circle], X, Y)}
+    return measure("círculo 2D (lejos)", modes, spaces, reference, X**2 + Y**2 > (2 * radius)**2, repeat)
+
+
+def conductors_2d_case(repeat: int = 3) -> list:
+    """
+    Dos círculos conductores alejados (bloques de bajo rango entre ellos) a
+    1 V y 0 V: las cargas resueltas deben reproducir esos potenciales en las
+    muestras.
+    """
+    radius = 0.5
+    potentials = [1.0, 0.0]
+    def evaluate():
+        conductors = [em_geometry_2d.Circle(1e-9, radius, [0, 0], 1024),
+                      em_geometry_2d.Circle(-1e-9, radius, [60 * radius, 0], 1024)]
+        em_conductors_2d.ConductorSystem(conductors).solve(potentials=potentials)
+        x = np.concatenate([Q.x for Q in conductors])
+        y = np.concatenate([Q.y for Q in conductors])
+        return {"V": sum(Q.potential(x, y) for Q in conductors)}
+    reference = {"V": np.repeat(potentials, 1024)}
+    mask = np.ones(2 * 1024, dtype=bool)
+    return measure("conductores 2D", [("ConductorSystem", evaluate, 1e-8)], (), reference, mask, repeat)
+
+
+def field_lines_2d_case(repeat: int = 3) -> list:
+    """
+    Dirección de los segmentos que traza FastFieldRenderer (gradiente del
+    potencial en la malla más trazado RK2) contra el campo analítico de un
+    dipolo en el punto medio de cada segmento.
+    """
+    q = 1e-9
+    positions = [np.array([-0.5, 0.0]), np.array([0.5, 0.0])]
+    space = np.linspace(-2, 2, 256)
+    X, Y = np.meshgrid(space, space)
+    V = sum(em_geometry_2d.Point(sign * q, p).potential(X, Y) for sign, p in zip((+1, -1), positions))
+
+    seconds = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Ey, Ex = np.gradient(-V, space[1] - space[0], space[1] - space[0])
+        segments, _ = em_geometry_2d.trace_field_lines(Ex, Ey, space, space)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    middle = segments.mean(axis=1)
+    E = np.zeros_like(middle)
+    for sign, p in zip((+1, -1), positions):
+        R = middle - p
+        E += sign * R / np.sum(R**2, axis=1, keepdims=True)**1.5
+    field_direction = E / np.linalg.norm(E, axis=1, keepdims=True)
+    direction = segments[:, 1] - segments[:, 0]
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    # Las líneas se trazan en ambos sentidos: se compara la dirección, no el sentido
+    direction *= np.sign(np.sum(direction * field_direction, axis=1, keepdims=True))
+    # Lejos de las cargas, donde el gradiente en la malla no domina
+    mask = np.min([np.linalg.norm(middle - p, axis=1) for p in positions], axis=0) > 0.3
+    return [_row("líneas de campo 2D", "FastFieldRenderer (trazado)", "dir.", list(direction.T),
+                 list(field_direction.T), mask, seconds, 5e-2)]
+
+
+CASES = (point_charge_case, infinite_line_case, charged_sphere_case, ring_axis_case, finite_segment_case,
+         point_charge_2d_case, circle_2d_case, conductors_2d_case, field_lines_2d_case)
+
+
+def run_harness(repeat: int = 3) -> list:
+    """ Corre todos los casos; devuelve las filas de measure. """
+    rows = []
+    for case in CASES:
+        rows += case(repeat)
+    return rows
+
+
+def print_report(rows: list) -> None:
+    """ Tabla de error relativo (máximo y RMS), presupuesto, fracción de puntos lejanos y costo por modo. """
+    header = (f"{'caso':<20}{'modo':<30}{'cant.':<7}{'puntos':>8}{'lejos':>7}{'error máx':>12}{'presup.':>10}"
+              f"{'error RMS':>12}{'tiempo (ms)':>13}{'ns/punto':>10}")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        far = f"{100 * row['far']:>6.0f}%" if row["far"] is not None else f"{'-':>7}"
+        status = "" if row["passed"] else "  FUERA DE PRESUPUESTO"
+        print(f"{row['case']:<20}{row['mode']:<30}{row['quantity']:<7}{row['points']:>8}{far}"
+              f"{row['max_error']:>12.2e}{row['budget']:>10.0e}{row['rms_error']:>12.2e}"
+              f"{1e3 * row['seconds']:>13.2f}{1e9 * row['seconds'] / row['points']:>10.0f}{status}")
+
+
+# TEST ROOM:
+if __name__ == "__main__":
+    rows = run_harness()
+    print_report(rows)
+    failures = [row for row in rows if not row["passed"]]
+    if failures:
+        raise SystemExit(f"{len(failures)} fila(s) superan su presupuesto de error.")
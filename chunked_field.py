@@ -0,0 +1,260 @@
+import os
+import itertools
+import numpy as np
+import utils
+""" Cálculo por bloques de campos 3D grandes, guardados en disco.
+
+    Para mallas de 512³ los arreglos Ex, Ey, Ez y V no caben juntos en
+    memoria. Aquí la malla se recorre por ladrillos (bricks): cada ladrillo
+    se evalúa con las mismas cargas de utils y se escribe directamente en
+    archivos .npy mapeados en memoria (np.memmap). Las etapas posteriores
+    (cortes, isosuperficies, exportación) leen los ladrillos de a uno.
+"""
+# Cantidades que se pueden calcular y guardar:
+QUANTITIES = ("Ex", "Ey", "Ez", "V", "Bx", "By", "Bz")
+
+
+class ChunkedField:
+    def __init__(
+            self,
+            directory: str,
+            x_space: np.ndarray,
+            y_space: np.ndarray,
+            z_space: np.ndarray,
+            brick_size: int = 64,
+            quantities: tuple = ("Ex", "Ey", "Ez", "V"),
+            ):
+        """
+        Crea (o sobrescribe) los archivos de un campo 3D en 'directory'.
+
+        Los arreglos tienen la forma de np.meshgrid(x_space, y_space, z_space),
+        es decir (len(y_space), len(x_space), len(z_space)).
+
+        Args:
+            directory (str): Carpeta donde se guardan los archivos .npy.
+            x_space (np.ndarray): Coordenadas x de la malla.
+            y_space (np.ndarray): Coordenadas y de la malla.
+            z_space (np.ndarray): Coordenadas z de la malla.
+            brick_size (int): Lado (en puntos) de cada ladrillo.
+            quantities (tuple): Subconjunto de QUANTITIES (las componentes de B
+                                solo se usan con corrientes de magnetostatics).
+        """
+        unknown = set(quantities) - set(QUANTITIES)
+        if unknown:
+            raise ValueError(f"Cantidades desconocidas: {sorted(unknown)}")
+        if brick_size < 1:
+            raise ValueError("El tamaño de ladrillo debe ser positivo.")
+
+        self.directory = directory
+        self.x_space = np.asarray(x_space, dtype=float)
+        self.y_space = np.asarray(y_space, dtype=float)
+        self.z_space = np.asarray(z_space, dtype=float)
+        self.brick_size = brick_size
+        self.shape = (len(self.y_space), len(self.x_space), len(self.z_space))
+
+        os.makedirs(directory, exist_ok=True)
+        np.savez(os.path.join(directory, "axes.npz"),
+                 x=self.x_space, y=self.y_space, z=self.z_space, brick_size=brick_size)
+        self.arrays = {}
+        for name in quantities:
+            self.arrays[name] = np.lib.format.open_memmap(
+                self._path(name), mode="w+", dtype=np.float64, shape=self.shape)
+
+    @classmethod
+    def open(cls, directory: str, mode: str = "r"):
+        """
+        Abre un campo ya calculado sin cargarlo en memoria.
+
+        Args:
+            directory (str): Carpeta creada por ChunkedField.
+            mode (str): "r" (solo lectura) o "r+" (lectura y escritura).
+
+        Returns:
+            ChunkedField
+        """
+        field = cls.__new__(cls)
+        axes = np.load(os.path.join(directory, "axes.npz"))
+        field.directory = directory
+        field.x_space = axes["x"]
+        field.y_space = axes["y"]
+        field.z_space = axes["z"]
+        field.brick_size = int(axes["brick_size"])
+        field.shape = (len(field.y_space), len(field.x_space), len(field.z_space))
+        field.arrays = {}
+        for name in QUANTITIES:
+            if os.path.exists(field._path(name)):
+                field.arrays[name] = np.load(field._path(name), mmap_mode=mode)
+        return field
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def bricks(self, ghost: int = 0):
+        """
+        Recorre la malla por ladrillos.
+
+        Args:
+            ghost (int): Capas extra que se solapan con los ladrillos vecinos
+                         (útil para isosuperficies o gradientes por bloques).
+
+        Yields:
+            tuple: Slices (iy, ix, iz) de cada ladrillo.
+        """
+        starts = [range(0, n, self.brick_size) for n in self.shape]
+        for start in itertools.product(*starts):
+            yield tuple(slice(max(s - ghost, 0), min(s + self.brick_size + ghost, n))
+                        for s, n in zip(start, self.shape))
+
+    def compute(self, charge_list: list) -> None:
+        """
+        Evalúa las fuentes ladrillo por ladrillo y escribe el resultado en disco.
+        La memoria usada está acotada por el tamaño de un ladrillo.
+
+        Args:
+            charge_list (list): Objetos con electric_field(X, Y, Z) y
+                                electric_potential(X, Y, Z) (cargas de utils)
+                                y/o magnetic_field(X, Y, Z) (corrientes de
+                                magnetostatics). Cada fuente aporta solo a las
+                                cantidades que sabe calcular.
+        """
+        vector_fields = (("electric_field", ("Ex", "Ey", "Ez")),
+                         ("magnetic_field", ("Bx", "By", "Bz")))
+        # Temporales compartidos por todas las cargas (y ladrillos del mismo tamaño)
+        workspace = utils.Workspace()
+        for iy, ix, iz in self.bricks():
+            X, Y, Z = np.meshgrid(self.x_space[ix], self.y_space[iy], self.z_space[iz])
+            for method, names in vector_fields:
+                if not any(name in self.arrays for name in names):
+                    continue
+                Fx = np.zeros_like(X)
+                Fy = np.zeros_like(Y)
+                Fz = np.zeros_like(Z)
+                for charge in charge_list:
+                    accumulate = getattr(charge, "accumulate_" + method, None)
+                    if accumulate is not None:
+                        accumulate(X, Y, Z, Fx, Fy, Fz, workspace)
+                        continue
+                    if not hasattr(charge, method):
+                        continue
+                    F_differential = getattr(charge, method)(X, Y, Z)
+                    # Sumar componentes del campo
+                    Fx += F_differential[0]
+                    Fy += F_differential[1]
+                    Fz += F_differential[2]
+                for name, F in zip(names, (Fx, Fy, Fz)):
+                    if name in self.arrays:
+                        self.arrays[name][iy, ix, iz] = F
+            if "V" in self.arrays:
+                V = np.zeros_like(X)
+                for charge in charge_list:
+                    if hasattr(charge, "accumulate_electric_potential"):
+                        charge.accumulate_electric_potential(X, Y, Z, V, workspace)
+                    elif hasattr(charge, "electric_potential"):
+                        V += charge.electric_potential(X, Y, Z)
+                self.arrays["V"][iy, ix, iz] = V
+        self.flush()
+
+    def flush(self) -> None:
+        """ Asegura que los datos escritos lleguen a disco. """
+        for array in self.arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def iter_bricks(self, name: str, ghost: int = 0):
+        """
+        Entrega una cantidad ladrillo por ladrillo (para exportar o procesar).
+
+        Args:
+            name (str): Una de QUANTITIES ("Ex", "V", "Bz"...).
+            ghost (int): Capas de solapamiento con los vecinos.
+
+        Yields:
+            tuple: (slices, bloque) con el bloque leído desde disco.
+        """
+        array = self.arrays[name]
+        for slices in self.bricks(ghost):
+            yield slices, np.asarray(array[slices])
+
+    def plane(self, name: str, axis: str, index: int) -> np.ndarray:
+        """
+        Lee un corte 2D sin cargar el volumen completo.
+
+        Args:
+            name (str): Una de QUANTITIES ("Ex", "V", "Bz"...).
+            axis (str): "x", "y" o "z" (eje perpendicular al corte).
+            index (int): Índice del corte sobre ese eje.
+
+        Returns:
+            np.ndarray: Arreglo 2D con el corte.
+        """
+        array = self.arrays[name]
+        if axis == "y":
+            return np.asarray(array[index, :, :])
+        elif axis == "x":
+            return np.asarray(array[:, index, :])
+        elif axis == "z":
+            return np.asarray(array[:, :, index])
+        raise ValueError("El eje debe ser 'x', 'y' o 'z'.")
+
+    def isosurface_points(self, name: str, level: float) -> np.ndarray:
+        """
+        Puntos de la malla donde la cantidad cruza 'level', por ladrillos.
+
+        Es una isosuperficie aproximada (celdas atravesadas por el nivel),
+        suficiente para dibujarla con scatter sin cargar el volumen.
+
+        Args:
+            name (str): Una de QUANTITIES ("Ex", "V", "Bz"...).
+            level (float): Valor de la isosuperficie.
+
+        Returns:
+            np.ndarray: Arreglo (N, 3) con coordenadas (x, y, z).
+        """
+        array = self.arrays[name]
+        points = []
+        for slices in self.bricks():
+            # Ladrillo con una capa extra para ver los cruces hacia los vecinos
+            grown = tuple(slice(max(s.start - 1, 0), min(s.stop + 1, n))
+                          for s, n in zip(slices, self.shape))
+            above = np.asarray(array[grown]) > level
+            crossing = np.zeros_like(above)
+            for axis in range(3):
+                change = np.diff(above, axis=axis)
+                index = [slice(None)] * 3
+                index[axis] = slice(0, -1)
+                crossing[tuple(index)] |= change
+            # Quedarse solo con los puntos propios del ladrillo
+            own = tuple(slice(s.start - g.start, s.stop - g.start) for s, g in zip(slices, grown))
+            jy, jx, jz = np.nonzero(crossing[own])
+            jy += slices[0].start
+            jx += slices[1].start
+            jz += slices[2].start
+            points.append(np.column_stack([self.x_space[jx], self.y_space[jy], self.z_space[jz]]))
+        return np.concatenate(points) if points else np.zeros((0, 3))
+
+
+# TEST ROOM:
+if __name__ == "__main__":
+    import tempfile
+    import matplotlib.pyplot as plt
+    import utils
+
+    point_charge_list = []
+    point_charge_list.append(utils.PointCharge(1, np.array([0.5, 0, 0])))
+    point_charge_list.append(utils.PointCharge(-1, np.array([-0.5, 0, 0])))
+
+    grid_points = 128
+    grid_size = 2
+    space = np.linspace(-grid_size, grid_size, grid_points)
+
+    field = ChunkedField(tempfile.mkdtemp(), space, space, space, brick_size=32)
+    field.compute(point_charge_list)
+
+    # Corte z = 0 leído desde disco
+    V = field.plane("V", "z", grid_points // 2)
+    fig, ax = plt.subplots(figsize=(8, 6))
+    cf = ax.contourf(space, space, V, levels=100, cmap='RdBu_r')
+    plt.colorbar(cf, ax=ax, label='Potencial eléctrico (V)')
+    ax.set_title('Corte z = 0 del potencial')
+    ax.set_aspect('equal')
+    plt.show()
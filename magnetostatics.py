@@ -0,0 +1,331 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.constants import mu_0, pi
+from scipy.special import ellipe, ellipk
+from matplotlib.colors import TwoSlopeNorm
+""" Magnetostática: campo B de corrientes estacionarias (Biot–Savart).
+
+    Contrapartes con corriente de las cargas del proyecto: tramos rectos
+    (como Line2), espiras circulares (como Circle) e hilos infinitos (como
+    InfiniteLineCharge). Todas usan fórmulas cerradas y se evalúan
+    vectorizadas sobre la malla, por bloques para acotar la memoria.
+"""
+# Atajos:
+O = np.array([0, 0, 0])
+
+# Número máximo de pares (punto, tramo) evaluados a la vez
+tile_size = 2**20
+
+
+def _as_3d(v) -> np.ndarray:
+    """ Completa con z = 0 los vectores dados en el plano. """
+    v = np.asarray(v, dtype=float)
+    return np.append(v, 0.0) if v.shape == (2,) else v
+
+
+# 0) Clase común para todas las corrientes:
+class Current:
+    def init_color(self, I):
+        if I > 0:
+            self.color = "red"
+        elif I < 0:
+            self.color = "blue"
+        else:
+            self.color = "black"
+
+
+# 1) Camino poligonal de tramos rectos
+class CurrentPath(Current):
+    def __init__ (
+            self,
+            current: float = 1.0,
+            points: np.array = np.array([[0, 0, 0], [1, 1, 0]]),
+            closed: bool = False,
+            ):
+        """
+        Corriente I que recorre los puntos dados en orden.
+
+        Args:
+            current (float): Corriente (A).
+            points (np.array): Vértices del camino (en 2D o 3D).
+            closed (bool): Si es True, se une el último punto con el primero.
+        """
+        self.current = current
+        self.init_color(current)
+        self.label = "Corriente"
+        points = np.array([_as_3d(p) for p in points])
+        if closed:
+            points = np.vstack([points, points[:1]])
+        if len(points) < 2:
+            raise ValueError("Se requieren al menos dos puntos.")
+        self.points = points
+        self.x = points[:, 0]
+        self.y = points[:, 1]
+        # Geometría de los tramos (precalculada una vez)
+        self.starts = points[:-1]
+        self.ends = points[1:]
+        self.segments = self.ends - self.starts
+
+    def magnetic_field(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray = None):
+        """
+        Calcula el campo magnético de todos los tramos con la fórmula cerrada
+            B = μ0 I / 4π · (L × r1) / |L × r1|² · (L·r1/|r1| - L·r2/|r2|)
+
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray, opcional): Meshgrid de coordenadas Z.
+                                      Si no se proporciona (o es None),
+                                      se evalúa en el plano z = 0.
+
+        Returns:
+            list: Una lista [Bx, By, Bz] con las componentes del campo magnético.
+        """
+        if Z is None:
+            Z = np.zeros_like(X)
+        X, Y, Z = np.broadcast_arrays(X, Y, Z)
+        P = np.stack([X.ravel(), Y.ravel(), Z.ravel()], axis=1).astype(float)
+        B = np.zeros_like(P)
+
+        # Bloques de puntos: cada bloque se evalúa contra todos los tramos a la vez
+        step = max(1, tile_size // len(self.segments))
+        L = self.segments[None, :, :]
+        for start in range(0, len(P), step):
+            p = P[start:start + step, None, :]
+            r1 = p - self.starts[None, :, :]
+            r2 = p - self.ends[None, :, :]
+            r1_norm = np.sqrt(np.sum(r1**2, axis=2))
+            r2_norm = np.sqrt(np.sum(r2**2, axis=2))
+            r1_norm = np.where(r1_norm != 0, r1_norm, 1e-20)  # evitar división por cero
+            r2_norm = np.where(r2_norm != 0, r2_norm, 1e-20)
+            cross = np.cross(L, r1)
+            cross_squared = np.sum(cross**2, axis=2)
+            # Sobre la recta del tramo el campo es nulo
+            cross_squared = np.where(cross_squared != 0, cross_squared, np.inf)
+            factor = (np.sum(L * r1, axis=2) / r1_norm - np.sum(L * r2, axis=2) / r2_norm) / cross_squared
+            B[start:start + step] = np.sum(factor[:, :, None] * cross, axis=1)
+
+        B *= mu_0 * self.current / (4 * pi)
+        return [B[:, 0].reshape(X.shape), B[:, 1].reshape(X.shape), B[:, 2].reshape(X.shape)]
+
+
+class CurrentSegment(CurrentPath):
+    def __init__ (
+            self,
+            current: float = 1.0,
+            pos1: np.array = O,
+            pos2: np.array = np.array([1, 1, 0]),
+            ):
+        super().__init__(current, [pos1, pos2])
+        self.label = "Tramo de corriente"
+
+
+# 2) Espira circular
+class CurrentLoop(Current):
+    def __init__ (
+            self,
+            current: float = 1.0,
+            radius: float = 1.0,
+            center: np.array = O,
+            normal: np.array = np.array([0, 0, 1]),
+            ):
+        """
+        Espira circular; la corriente gira en sentido antihorario visto desde
+        la punta del vector normal.
+
+        Args:
+            current (float): Corriente (A).
+            radius (float): Radio de la espira.
+            center (np.array): Centro (en 2D o 3D).
+            normal (np.array): Vector normal al plano de la espira.
+        """
+        self.current = current
+        self.radius = radius
+        self.init_color(current)
+        self.label = "Espira de corriente"
+        self.center = _as_3d(center)
+        normal = _as_3d(normal)
+        if not np.any(normal):
+            raise ValueError("El vector normal no puede ser un vector nulo (0,0,0).")
+        self.normal = normal / np.linalg.norm(normal)
+
+        # Puntos de la espira para dibujarla
+        u = np.cross(self.normal, [1, 0, 0])
+        if np.linalg.norm(u) < 1e-8:
+            u = np.cross(self.normal, [0, 1, 0])
+        u /= np.linalg.norm(u)
+        v = np.cross(self.normal, u)
+        t = np.linspace(0, 2*pi, 129)
+        points = self.center + radius * (np.outer(np.cos(t), u) + np.outer(np.sin(t), v))
+        self.x = points[:, 0]
+        self.y = points[:, 1]
+
+    def magnetic_field(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray = None):
+        """
+        Calcula el campo magnético de la espira con integrales elípticas.
+
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray, opcional): Meshgrid de coordenadas Z.
+                                      Si no se proporciona (o es None),
+                                      se evalúa en el plano z = 0.
+
+        Returns:
+            list: Una lista [Bx, By, Bz] con las componentes del campo magnético.
+        """
+        if Z is None:
+            Z = np.zeros_like(X)
+        a = self.radius
+        n = self.normal
+
+        # Coordenadas cilíndricas respecto al eje de la espira
+        Rx = X - self.center[0]
+        Ry = Y - self.center[1]
+        Rz = Z - self.center[2]
+        z = Rx * n[0] + Ry * n[1] + Rz * n[2]
+        rho_x = Rx - z * n[0]
+        rho_y = Ry - z * n[1]
+        rho_z = Rz - z * n[2]
+        rho = np.sqrt(rho_x**2 + rho_y**2 + rho_z**2)
+
+        alpha_squared = (a - rho)**2 + z**2
+        alpha_squared = np.where(alpha_squared != 0, alpha_squared, 1e-20)  # evitar división por cero
+        beta_squared = (a + rho)**2 + z**2
+        beta = np.sqrt(beta_squared)
+        m = 4 * a * rho / beta_squared
+        m = np.minimum(m, 1 - 1e-16)  # evitar K(1) = inf sobre el hilo
+        K = ellipk(m)
+        E = ellipe(m)
+
+        C = mu_0 * self.current / (2 * pi)
+        B_axial = C / beta * (K + (a**2 - rho**2 - z**2) / alpha_squared * E)
+        # rho * B_rho; el vector radial es (rho * B_rho) / rho² · rho_vec, nulo sobre el eje
+        B_radial = C * z / beta * (-K + (a**2 + rho**2 + z**2) / alpha_squared * E)
+        B_radial = np.where(rho != 0, B_radial / np.where(rho != 0, rho**2, 1), 0)
+
+        Bx = B_axial * n[0] + B_radial * rho_x
+        By = B_axial * n[1] + B_radial * rho_y
+        Bz = B_axial * n[2] + B_radial * rho_z
+        return [Bx, By, Bz]
+
+
+# 3) Hilo infinito
+class InfiniteWire(Current):
+    def __init__ (
+            self,
+            current: float = 1.0,
+            line_point: np.array = O,
+            line_direction: np.array = [0, 0, 1],
+            ):
+        self.current = current
+        self.init_color(current)
+        self.label = "Hilo de corriente"
+        self.line_point = _as_3d(line_point)
+        line_direction = _as_3d(line_direction)
+        if not np.any(line_direction):
+            raise ValueError("El vector de dirección de la línea no puede ser un vector nulo (0,0,0).")
+        self.line_direction = line_direction / np.linalg.norm(line_direction)
+
+        # Tramo largo para dibujarlo (un punto si el hilo es perpendicular al plano xy)
+        points = self.line_point + np.outer([-1e3, 1e3], self.line_direction)
+        if np.allclose(self.line_direction[:2], 0):
+            points = self.line_point[None, :]
+        self.x = points[:, 0]
+        self.y = points[:, 1]
+
+    def magnetic_field(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray = None):
+        """
+        Calcula el campo magnético del hilo: B = μ0 I / (2π ρ²) · (t × ρ).
+
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray, opcional): Meshgrid de coordenadas Z.
+                                      Si no se proporciona (o es None),
+                                      se evalúa en el plano z = 0.
+
+        Returns:
+            list: Una lista [Bx, By, Bz] con las componentes del campo magnético.
+        """
+        if Z is None:
+            Z = np.zeros_like(X)
+        t = self.line_direction
+
+        QPx = X - self.line_point[0]
+        QPy = Y - self.line_point[1]
+        QPz = Z - self.line_point[2]
+        QP_dot_t = QPx * t[0] + QPy * t[1] + QPz * t[2]
+        RPx = QPx - t[0] * QP_dot_t
+        RPy = QPy - t[1] * QP_dot_t
+        RPz = QPz - t[2] * QP_dot_t
+
+        R_squared = RPx**2 + RPy**2 + RPz**2
+        R2 = np.where(R_squared != 0, R_squared, 1e-20)  # evitar división por cero
+
+        multiplying_factor = mu_0 * self.current / (2 * pi * R2)
+        Bx = multiplying_factor * (t[1] * RPz - t[2] * RPy)
+        By = multiplying_factor * (t[2] * RPx - t[0] * RPz)
+        Bz = multiplying_factor * (t[0] * RPy - t[1] * RPx)
+        return [Bx, By, Bz]
+
+
+def plot_magnetic_field(current_list: list, x: np.ndarray, y: np.ndarray, z: float = 0.0) -> None:
+    """
+    Dibuja B en el plano z = cte: la componente Bz como mapa de colores y
+    las líneas del campo en el plano (Bx, By).
+    """
+    [X, Y] = np.meshgrid(x, y)
+    Z = np.full_like(X, z)
+
+    Bx = np.zeros_like(X)
+    By = np.zeros_like(X)
+    Bz = np.zeros_like(X)
+    for I in current_list:
+        B_differential = I.magnetic_field(X, Y, Z)
+        Bx += B_differential[0]
+        By += B_differential[1]
+        Bz += B_differential[2]
+
+    # Figura
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    # Componente perpendicular al plano como mapa de colores
+    if Bz.min() < 0 < Bz.max():
+        norm = TwoSlopeNorm(vmin=Bz.min(), vcenter=0, vmax=Bz.max())
+    else:
+        norm = None
+    cf = ax.contourf(X, Y, Bz, levels=100, cmap='PuOr_r', norm=norm)
+    cbar = plt.colorbar(cf, ax=ax, label='Campo magnético Bz (T)')
+
+    # Líneas de campo en el plano
+    magnitude = np.sqrt(Bx**2 + By**2)
+    if magnitude.max() > 1e-12 * np.abs(Bz).max():
+        ax.streamplot(X, Y, Bx, By, color=magnitude, linewidth=0.7, cmap='viridis', density=1.5)
+
+    # Corrientes dibujadas sobre el gráfico
+    for I in current_list:
+        ax.plot(I.x, I.y, '.-', color=I.color, linewidth=2, label=I.label)
+
+    # Detalles del gráfico
+    ax.set_title('Campo magnético')
+    ax.set_xlabel('x (m)')
+    ax.set_ylabel('y (m)')
+    ax.set_xlim(x.min(), x.max())
+    ax.set_ylim(y.min(), y.max())
+    ax.set_aspect('equal')
+    ax.legend(loc="lower right")
+
+    plt.tight_layout()
+    plt.show()
+
+# TEST ROOM:
+if __name__ == "__main__":
+    current_list = []
+    current_list.append(InfiniteWire(current=+1, line_point=[-0.5, 0]))
+    current_list.append(InfiniteWire(current=-1, line_point=[+0.5, 0]))
+
+    x = np.linspace(-2, 2, 128)
+    y = np.linspace(-2, 2, 128)
+
+    plot_magnetic_field(current_list, x, y)
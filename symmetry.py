@@ -0,0 +1,286 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.interpolate import RegularGridInterpolator
+import utils
+""" Evaluación con simetrías para escenas 3D de cargas (utils).
+
+    Si la escena y la malla son simétricas respecto a los planos centrales de
+    la malla, solo se evalúa un dominio fundamental y el resto se obtiene
+    reflejando (2x por plano, hasta 8x). Las simetrías se pueden declarar o
+    detectar a partir de las cargas. Para escenas axisimétricas el campo se
+    calcula sobre un plano (r, z) y se lleva a la malla 3D por interpolación.
+"""
+# Atajos:
+O = np.array([0, 0, 0])
+
+# Generadores de simetría: eje que invierte cada reflexión
+_mirror_axes = {"mirror_x": 0, "mirror_y": 1, "mirror_z": 2}
+# Los ejes de los arreglos de np.meshgrid son (y, x, z)
+_array_axes = {0: 1, 1: 0, 2: 2}
+
+
+def _samples(charge_list: list):
+    """ Posiciones (N, 3) y cargas (N,) de las cargas puntuales de la escena. """
+    positions = []
+    magnitudes = []
+    for charge in charge_list:
+        if hasattr(charge, "positions"):  # ChargeDistribution
+            positions.append(np.asarray(charge.positions, dtype=float))
+            magnitudes.append(np.asarray(charge.magnitudes, dtype=float))
+        elif hasattr(charge, "position") and len(charge.position) == 3:  # PointCharge
+            positions.append(np.asarray(charge.position, dtype=float)[None, :])
+            magnitudes.append(np.array([charge.magnitude], dtype=float))
+        else:
+            return None
+    return np.vstack(positions), np.concatenate(magnitudes)
+
+
+def detect_symmetries(
+        charge_list: list,
+        x_space: np.ndarray,
+        y_space: np.ndarray,
+        z_space: np.ndarray,
+        tolerance: float = 1e-9,
+        ) -> list:
+    """
+    Busca reflexiones respecto a los planos centrales de la malla que dejan
+    la escena invariante (par, +1) o que invierten el signo de las cargas
+    (impar, -1).
+
+    Args:
+        charge_list (list): Cargas de utils (PointCharge, ChargeDistribution).
+        x_space (np.ndarray): Coordenadas x de la malla.
+        y_space (np.ndarray): Coordenadas y de la malla.
+        z_space (np.ndarray): Coordenadas z de la malla.
+        tolerance (float): Tolerancia relativa en posiciones y cargas.
+
+    Returns:
+        list: Pares (nombre, paridad), p. ej. [("mirror_z", +1)].
+    """
+    samples = _samples(charge_list)
+    if samples is None:
+        return []
+    positions, magnitudes = samples
+    spaces = [np.asarray(s, dtype=float) for s in (x_space, y_space, z_space)]
+    center = np.array([(s[0] + s[-1]) / 2 for s in spaces])
+    scale = max(np.ptp(positions), max(np.ptp(s) for s in spaces), 1e-300)
+    distance = tolerance * scale
+
+    # Carga total en torno a cada muestra (agrupa muestras repetidas)
+    tree = cKDTree(positions)
+    def charge_near(points):
+        pairs = tree.sparse_distance_matrix(cKDTree(points), distance, output_type="ndarray")
+        return np.bincount(pairs["j"], weights=magnitudes[pairs["i"]], minlength=len(points))
+    own = charge_near(positions)
+    charge_tolerance = tolerance * np.abs(magnitudes).max()
+
+    symmetries = []
+    for name, axis in _mirror_axes.items():
+        s = spaces[axis] - center[axis]
+        if not np.allclose(s, -s[::-1], atol=distance, rtol=0):
+            continue  # la malla no es simétrica en este eje
+        mirrored = positions.copy()
+        mirrored[:, axis] = 2 * center[axis] - mirrored[:, axis]
+        image = charge_near(mirrored)
+        for parity in (+1, -1):
+            if np.allclose(image, parity * own, atol=charge_tolerance, rtol=0):
+                symmetries.append((name, parity))
+                break
+    return symmetries
+
+
+def _check_symmetries(charge_list: list, spaces: list, symmetries: list, probes: int = 16) -> None:
+    """
+    Verifica simetrías declaradas: la malla debe ser simétrica respecto a su
+    plano central y la escena debe cumplir V(M p) = paridad · V(p) en unos
+    pocos puntos p de la malla. Si no, ValueError.
+    """
+    center = np.array([(s[0] + s[-1]) / 2 for s in spaces])
+    distance = 1e-9 * max(np.ptp(s) for s in spaces)
+    rng = np.random.default_rng(0)
+    probe = np.array([s[rng.integers(0, len(s), probes)] for s in spaces])
+    workspace = utils.Workspace()
+    def potential(points):
+        V = np.zeros(probes)
+        for charge in charge_list:
+            charge.accumulate_electric_potential(points[0], points[1], points[2], V, workspace)
+        return V
+    own = potential(probe)
+    for name, parity in symmetries:
+        if name not in _mirror_axes:
+            raise ValueError(f"Simetría desconocida: '{name}'.")
+        axis = _mirror_axes[name]
+        s = spaces[axis] - center[axis]
+        if not np.allclose(s, -s[::-1], atol=distance, rtol=0):
+            raise ValueError(f"La malla no es simétrica respecto a '{name}'.")
+        mirrored = probe.copy()
+        mirrored[axis] = 2 * center[axis] - mirrored[axis]
+        image = potential(mirrored)
+        finite = np.isfinite(own) & np.isfinite(image)  # sondas sobre una carga
+        scale = np.abs(own[finite]).max(initial=0)
+        if not np.allclose(image[finite], parity * own[finite], atol=1e-6 * scale, rtol=0):
+            raise ValueError(f"La escena no tiene la simetría ('{name}', {parity:+d}) respecto al centro de la malla.")
+
+
+def _fundamental_domain(charge_list, x_space, y_space, z_space, symmetries, field: bool):
+    """
+    Evalúa solo la primera mitad de la malla en cada eje con reflexión y
+    completa el resto con np.flip y la paridad: V(M p) = s V(p) y
+    E(M p) = s M E(p), es decir, la componente normal al plano cambia de signo
+    respecto a las otras dos.
+    """
+    spaces = [np.asarray(s, dtype=float) for s in (x_space, y_space, z_space)]
+    if symmetries == "auto":
+        symmetries = detect_symmetries(charge_list, *spaces)
+    else:
+        _check_symmetries(charge_list, spaces, symmetries)
+    symmetries = dict(symmetries)
+
+    halves = [(len(s) + 1) // 2 if name in symmetries else len(s)
+              for name, s in zip(_mirror_axes, spaces)]
+    X, Y, Z = np.meshgrid(*(s[:h] for s, h in zip(spaces, halves)))
+    workspace = utils.Workspace()
+    if field:
+        values = [np.zeros(X.shape) for _ in range(3)]
+        for charge in charge_list:
+            charge.accumulate_electric_field(X, Y, Z, *values, workspace)
+    else:
+        values = [np.zeros(X.shape)]
+        for charge in charge_list:
+            charge.accumulate_electric_potential(X, Y, Z, values[0], workspace)
+
+    # Completar: cada mitad copiada es la imagen de la ya calculada
+    for name, axis in _mirror_axes.items():
+        if name not in symmetries:
+            continue
+        array_axis = _array_axes[axis]
+        half = [slice(None)] * 3
+        half[array_axis] = slice(0, len(spaces[axis]) // 2)
+        for k, F in enumerate(values):
+            sign = -symmetries[name] if field and k == axis else symmetries[name]
+            values[k] = np.concatenate([F, sign * np.flip(F[tuple(half)], axis=array_axis)], axis=array_axis)
+    return values if field else values[0]
+
+
+def symmetric_electric_field(
+        charge_list: list,
+        x_space: np.ndarray,
+        y_space: np.ndarray,
+        z_space: np.ndarray,
+        symmetries="auto",
+        ):
+    """
+    Campo eléctrico total sobre np.meshgrid(x_space, y_space, z_space),
+    evaluando solo el dominio fundamental.
+
+    Args:
+        charge_list (list): Cargas de utils.
+        x_space (np.ndarray): Coordenadas x de la malla.
+        y_space (np.ndarray): Coordenadas y de la malla.
+        z_space (np.ndarray): Coordenadas z de la malla.
+        symmetries: "auto" para detectarlas, o lista de pares (nombre, paridad)
+                    con nombre en "mirror_x", "mirror_y", "mirror_z". Las
+                    declaradas se verifican (ValueError si no se cumplen).
+
+    Returns:
+        list: Una lista [Ex, Ey, Ez] con las componentes del campo eléctrico.
+    """
+    return _fundamental_domain(charge_list, x_space, y_space, z_space, symmetries, field=True)
+
+
+def symmetric_electric_potential(
+        charge_list: list,
+        x_space: np.ndarray,
+        y_space: np.ndarray,
+        z_space: np.ndarray,
+        symmetries="auto",
+        ):
+    """
+    Potencial eléctrico total sobre np.meshgrid(x_space, y_space, z_space),
+    evaluando solo el dominio fundamental.
+
+    Args:
+        charge_list (list): Cargas de utils.
+        x_space (np.ndarray): Coordenadas x de la malla.
+        y_space (np.ndarray): Coordenadas y de la malla.
+        z_space (np.ndarray): Coordenadas z de la malla.
+        symmetries: "auto" para detectarlas, o lista de pares (nombre, paridad),
+                    verificados como en symmetric_electric_field.
+
+    Returns:
+        np.ndarray: V
+    """
+    return _fundamental_domain(charge_list, x_space, y_space, z_space, symmetries, field=False)
+
+
+def axisymmetric_field(
+        charge_list: list,
+        X: np.ndarray,
+        Y: np.ndarray,
+        Z: np.ndarray,
+        axis_point: np.array = O,
+        axis_direction: np.array = [0, 0, 1],
+        samples: tuple = None,
+        ):
+    """
+    Campo y potencial de una escena axisimétrica (declarada por el usuario)
+    a partir de una evaluación en el semiplano (r, z).
+
+    Args:
+        charge_list (list): Cargas de utils.
+        X (np.ndarray): Meshgrid de coordenadas X.
+        Y (np.ndarray): Meshgrid de coordenadas Y.
+        Z (np.ndarray): Meshgrid de coordenadas Z.
+        axis_point (np.array): Un punto del eje de simetría.
+        axis_direction (np.array): Dirección del eje de simetría.
+        samples (tuple, opcional): Puntos (en r, en z) del plano de evaluación.
+                                   Por defecto, 4 veces el lado mayor de la malla;
+                                   más puntos dan una interpolación más precisa.
+
+    Returns:
+        tuple: ([Ex, Ey, Ez], V)
+    """
+    c = np.asarray(axis_point, dtype=float)
+    n = np.asarray(axis_direction, dtype=float)
+    n = n / np.linalg.norm(n)
+    u = np.cross(n, [1, 0, 0])
+    if np.linalg.norm(u) < 1e-8:
+        u = np.cross(n, [0, 1, 0])
+    u /= np.linalg.norm(u)
+
+    # Coordenadas cilíndricas de la malla
+    Rx, Ry, Rz = X - c[0], Y - c[1], Z - c[2]
+    z = Rx * n[0] + Ry * n[1] + Rz * n[2]
+    rho_x, rho_y, rho_z = Rx - z * n[0], Ry - z * n[1], Rz - z * n[2]
+    rho = np.sqrt(rho_x**2 + rho_y**2 + rho_z**2)
+
+    # Evaluación en el semiplano generado por u y n
+    if samples is None:
+        samples = (4 * max(X.shape), 4 * max(X.shape))
+    r_space = np.linspace(0, rho.max(), samples[0])
+    z_space = np.linspace(z.min(), z.max(), max(samples[1], 2))
+    r_plane, z_plane = np.meshgrid(r_space, z_space, indexing="ij")
+    P = c[:, None, None] + u[:, None, None] * r_plane + n[:, None, None] * z_plane
+    E_plane = np.zeros((3,) + r_plane.shape)
+    V_plane = np.zeros(r_plane.shape)
+    workspace = utils.Workspace()
+    for charge in charge_list:
+        charge.accumulate_electric_field(P[0], P[1], P[2], E_plane[0], E_plane[1], E_plane[2], workspace)
+        charge.accumulate_electric_potential(P[0], P[1], P[2], V_plane, workspace)
+    E_r_plane = np.tensordot(u, E_plane, axes=(0, 0))
+    E_z_plane = np.tensordot(n, E_plane, axes=(0, 0))
+
+    # Llevar a la malla 3D
+    points = np.stack([rho.ravel(), z.ravel()], axis=1)
+    method = "cubic" if min(r_plane.shape) >= 4 else "linear"
+    def interpolate(values):
+        return RegularGridInterpolator((r_space, z_space), values, method=method)(points).reshape(X.shape)
+    V = interpolate(V_plane)
+    E_r = interpolate(E_r_plane)
+    E_z = interpolate(E_z_plane)
+    safe_rho = np.where(rho != 0, rho, 1)
+    E_r = np.where(rho != 0, E_r / safe_rho, 0)
+    Ex = E_r * rho_x + E_z * n[0]
+    Ey = E_r * rho_y + E_z * n[1]
+    Ez = E_r * rho_z + E_z * n[2]
+    return [Ex, Ey, Ez], V
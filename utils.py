@@ -8,8 +8,65 @@ from scipy.constants import e, epsilon_0, pi
 O = np.array([0, 0, 0])
 
 # 0) Clase común para todas las cargas:
+class Workspace:
+    def __init__(self):
+        """
+        Arreglos temporales reutilizables por los métodos accumulate_* de las
+        cargas. Al superponer muchas cargas sobre la misma malla se comparte
+        un solo Workspace, así que no se reserva memoria por carga.
+        """
+        self._arrays = {}
+
+    def array(self, name: str, shape: tuple, dtype) -> np.ndarray:
+        """ Arreglo 'name' (sin inicializar); se reserva solo si cambia la forma o el dtype. """
+        array = self._arrays.get(name)
+        if array is None or array.shape != tuple(shape) or array.dtype != dtype:
+            array = np.empty(shape, dtype=dtype)
+            self._arrays[name] = array
+        return array
+
+
 class Charge:
-    pass
+    def accumulate_electric_field(
+            self,
+            X: np.ndarray,
+            Y: np.ndarray,
+            Z: np.ndarray,
+            Ex: np.ndarray,
+            Ey: np.ndarray,
+            Ez: np.ndarray = None,
+            workspace: Workspace = None,
+            ) -> None:
+        """
+        Suma el campo eléctrico de la carga a Ex, Ey (y Ez), que pertenecen al
+        llamador. Versión genérica: las subclases con un núcleo propio la
+        reemplazan por una que no reserva memoria.
+
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray): Meshgrid de coordenadas Z, o None en 2D.
+            Ex (np.ndarray): Componente x acumulada (se modifica).
+            Ey (np.ndarray): Componente y acumulada (se modifica).
+            Ez (np.ndarray, opcional): Componente z acumulada (se modifica).
+            workspace (Workspace, opcional): Temporales reutilizables.
+        """
+        E_differential = self.electric_field(X, Y, Z)
+        Ex += E_differential[0]
+        Ey += E_differential[1]
+        if Ez is not None and E_differential[2] is not None:
+            Ez += E_differential[2]
+
+    def accumulate_electric_potential(
+            self,
+            X: np.ndarray,
+            Y: np.ndarray,
+            Z: np.ndarray,
+            V: np.ndarray,
+            workspace: Workspace = None,
+            ) -> None:
+        """ Suma el potencial eléctrico de la carga a V (versión genérica). """
+        V += self.electric_potential(X, Y, Z)
 
 # 1) Carga puntual
 class PointCharge(Charge):
@@ -21,44 +78,124 @@ class PointCharge(Charge):
         self.magnitude = magnitude
         self.position = position
     
-    def electric_field(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray = None):
+    def _is3d(self, Z) -> bool:
+        # Si es un caso 2D, no se usa Z
+        return not (Z is None or len(self.position) < 3)
+
+    def _distance_squared(self, X, Y, Z, shape, dtype, workspace):
+        """ Rx, Ry, (Rz) y R² en arreglos del workspace. """
+        R = []
+        for name, C, c in zip(("Rx", "Ry", "Rz"), (X, Y, Z), self.position[:3 if self._is3d(Z) else 2]):
+            Ri = workspace.array(name, shape, dtype)
+            np.subtract(C, c, out=Ri)
+            R.append(Ri)
+        R_squared = workspace.array("R_squared", shape, dtype)
+        temporary = workspace.array("temporary", shape, dtype)
+        np.multiply(R[0], R[0], out=R_squared)
+        for Ri in R[1:]:
+            np.multiply(Ri, Ri, out=temporary)
+            R_squared += temporary
+        return R, R_squared
+
+    def _dtype(self, X, Y, Z):
+        """ dtype del resultado (el mismo que daría X - position). """
+        coordinates = [X, Y, Z] if self._is3d(Z) else [X, Y]
+        return np.result_type(*coordinates, np.asarray(self.position).dtype, 1.0)
+
+    def accumulate_electric_field(
+            self,
+            X: np.ndarray,
+            Y: np.ndarray,
+            Z: np.ndarray,
+            Ex: np.ndarray,
+            Ey: np.ndarray,
+            Ez: np.ndarray = None,
+            workspace: Workspace = None,
+            ) -> None:
         """
-        Calcula el campo eléctrico generado por una carga puntual.
+        Suma el campo eléctrico de la carga puntual a Ex, Ey (y Ez) sin
+        reservar memoria: todos los temporales viven en el workspace.
 
         Args:
             X (np.ndarray): Meshgrid de coordenadas X.
             Y (np.ndarray): Meshgrid de coordenadas Y.
-            Z (np.ndarray, opcional): Meshgrid de coordenadas Z.
-                                      Si no se proporciona (o es None),
-                                      se asume un cálculo en 2D.
+            Z (np.ndarray): Meshgrid de coordenadas Z, o None en 2D.
+            Ex (np.ndarray): Componente x acumulada (se modifica).
+            Ey (np.ndarray): Componente y acumulada (se modifica).
+            Ez (np.ndarray, opcional): Componente z acumulada (se modifica).
+            workspace (Workspace, opcional): Temporales reutilizables.
+        """
+        workspace = workspace if workspace is not None else Workspace()
+        shape, dtype = Ex.shape, Ex.dtype
 
-        Returns:
-            list: Una lista [Ex, Ey, Ez] con las componentes del campo eléctrico.
-                  Si el cálculo es 2D, Ez será un array de ceros.
+        # Cálculo de distancia:
+        R, R_squared = self._distance_squared(X, Y, Z, shape, dtype, workspace)
+        R_cubed = workspace.array("factor", shape, dtype)
+        np.sqrt(R_squared, out=R_cubed)
+        R_cubed *= R_squared
+        is_zero = workspace.array("is_zero", shape, bool)
+        np.equal(R_squared, 0, out=is_zero)
+        np.copyto(R_cubed, 1e-20, where=is_zero)  # evitar división por cero
+
+        # Cálculo del campo:
+        multiplying_factor = np.divide(1/(4*pi*epsilon_0) * self.magnitude, R_cubed, out=R_cubed)
+        outputs = (Ex, Ey, Ez) if self._is3d(Z) and Ez is not None else (Ex, Ey)
+        for E, Ri in zip(outputs, R):
+            Ri *= multiplying_factor
+            E += Ri
+
+    def accumulate_electric_potential(
+            self,
+            X: np.ndarray,
+            Y: np.ndarray,
+            Z: np.ndarray,
+            V: np.ndarray,
+            workspace: Workspace = None,
+            ) -> None:
         """
+        Suma el potencial eléctrico de la carga puntual a V sin reservar memoria.
 
-        # Si es un caso 2D, se define Z de manera auxiliar
-        if Z is None or len(self.position) < 3:
-            is3d = False
-        else:
-            is3d = True
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray): Meshgrid de coordenadas Z, o None en 2D.
+            V (np.ndarray): Potencial acumulado (se modifica).
+            workspace (Workspace, opcional): Temporales reutilizables.
+        """
+        workspace = workspace if workspace is not None else Workspace()
+        shape, dtype = V.shape, V.dtype
 
         # Cálculo de distancia:
-        Rx = X - self.position[0]
-        Ry = Y - self.position[1]
-        Rz = Z - self.position[2] if is3d else np.zeros_like(Rx)
+        _, R_squared = self._distance_squared(X, Y, Z, shape, dtype, workspace)
+        R = np.sqrt(R_squared, out=R_squared)
+        is_zero = workspace.array("is_zero", shape, bool)
+        np.equal(R, 0, out=is_zero)
+        np.copyto(R, 1e-20, where=is_zero)  # evitar división por cero
 
-        R_squared = Rx**2 + Ry**2 + Rz**2
-        R = np.sqrt(R_squared)
-        R_cubed = np.where(R_squared != 0, R_squared * R, 1e-20)  # evitar división por cero
+        V += np.divide(1 / (4 * pi * epsilon_0) * self.magnitude, R, out=R)
 
-        # Cálculo del campo:
-        multiplying_factor = 1/(4*pi*epsilon_0) * self.magnitude / R_cubed
+    def electric_field(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray = None):
+        """
+        Calcula el campo eléctrico generado por una carga puntual.
 
-        Ex = multiplying_factor * Rx
-        Ey = multiplying_factor * Ry
-        Ez = multiplying_factor * Rz if is3d else None
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray, opcional): Meshgrid de coordenadas Z.
+                                      Si no se proporciona (o es None),
+                                      se asume un cálculo en 2D.
 
+        Returns:
+            list: Una lista [Ex, Ey, Ez] con las componentes del campo eléctrico.
+                  Si el cálculo es 2D, Ez será None.
+        """
+        is3d = self._is3d(Z)
+        shape = np.broadcast_shapes(*[np.shape(C) for C in ([X, Y, Z] if is3d else [X, Y])])
+        dtype = self._dtype(X, Y, Z)
+        Ex = np.zeros(shape, dtype=dtype)
+        Ey = np.zeros(shape, dtype=dtype)
+        Ez = np.zeros(shape, dtype=dtype) if is3d else None
+        self.accumulate_electric_field(X, Y, Z, Ex, Ey, Ez)
         return [Ex, Ey, Ez]
     
 
@@ -81,23 +218,9 @@ class PointCharge(Charge):
         Returns:
             float: V
         """
-
-        # Si es un caso 2D, se define Z de manera auxiliar
-        if Z is None or len(self.position) < 3:
-            is3d = False 
-        else:
-            is3d = True
-
-        # Cálculo de distancia:
-        Rx = X - self.position[0]
-        Ry = Y - self.position[1]
-        Rz = Z - self.position[2] if is3d else np.zeros_like(Rx)
-
-        R_squared = Rx**2 + Ry**2 + Rz**2
-        R = np.where(R_squared != 0, np.sqrt(R_squared), 1e-20)  # evitar división por cero
-
-        # Cálculo del campo:
-        V = 1 / (4 * pi * epsilon_0) * self.magnitude / R
+        shape = np.broadcast_shapes(*[np.shape(C) for C in ([X, Y, Z] if self._is3d(Z) else [X, Y])])
+        V = np.zeros(shape, dtype=self._dtype(X, Y, Z))
+        self.accumulate_electric_potential(X, Y, Z, V)
         return V
 
 # 2) Carga de línea:
@@ -112,6 +235,80 @@ class InfiniteLineCharge(Charge):
         self.line_point = line_point
         self.line_direction = line_direction
 
+    def _is3d(self, Z) -> bool:
+        # Si es un caso 2D, no se usa Z
+        return not (Z is None or len(self.line_point) < 3 or len(self.line_direction) < 3)
+
+    def accumulate_electric_field(
+            self,
+            X: np.ndarray,
+            Y: np.ndarray,
+            Z: np.ndarray,
+            Ex: np.ndarray,
+            Ey: np.ndarray,
+            Ez: np.ndarray = None,
+            workspace: Workspace = None,
+            ) -> None:
+        """
+        Suma el campo eléctrico de la carga de línea a Ex, Ey (y Ez) sin
+        reservar memoria: todos los temporales viven en el workspace.
+
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray): Meshgrid de coordenadas Z, o None en 2D.
+            Ex (np.ndarray): Componente x acumulada (se modifica).
+            Ey (np.ndarray): Componente y acumulada (se modifica).
+            Ez (np.ndarray, opcional): Componente z acumulada (se modifica).
+            workspace (Workspace, opcional): Temporales reutilizables.
+        """
+        workspace = workspace if workspace is not None else Workspace()
+        shape, dtype = Ex.shape, Ex.dtype
+        dimension = 3 if self._is3d(Z) else 2
+
+        # Vector guía de la línea:
+        v = self.line_direction[:dimension]
+        magnitude_v_squared = sum(vi**2 for vi in v)
+        if magnitude_v_squared == 0:
+            raise ValueError("El vector de dirección de la línea no puede ser un vector nulo (0,0,0).")
+
+        # Vector que va desde el punto Q de la línea al punto P = (x,y,z)
+        QP = []
+        for name, C, c in zip(("Rx", "Ry", "Rz"), (X, Y, Z), self.line_point[:dimension]):
+            QPi = workspace.array(name, shape, dtype)
+            np.subtract(C, c, out=QPi)
+            QP.append(QPi)
+
+        # Vector que va desde el punto más cercano R de la línea al punto P
+        aux = workspace.array("aux", shape, dtype)
+        temporary = workspace.array("temporary", shape, dtype)
+        np.multiply(QP[0], v[0], out=aux)
+        for QPi, vi in zip(QP[1:], v[1:]):
+            np.multiply(QPi, vi, out=temporary)
+            aux += temporary
+        aux /= magnitude_v_squared
+        for QPi, vi in zip(QP, v):
+            np.multiply(aux, vi, out=temporary)
+            QPi -= temporary
+        RP = QP
+
+        R2 = workspace.array("R_squared", shape, dtype)
+        np.multiply(RP[0], RP[0], out=R2)
+        for RPi in RP[1:]:
+            np.multiply(RPi, RPi, out=temporary)
+            R2 += temporary
+        is_zero = workspace.array("is_zero", shape, bool)
+        np.equal(R2, 0, out=is_zero)
+        np.copyto(R2, 1e-20, where=is_zero)  # evitar división por cero
+
+        # Cálculo del campo:
+        R2 *= 2*pi*epsilon_0
+        multiplying_factor = np.divide(self.charge_density, R2, out=R2)
+        outputs = (Ex, Ey, Ez) if dimension == 3 and Ez is not None else (Ex, Ey)
+        for E, RPi in zip(outputs, RP):
+            RPi *= multiplying_factor
+            E += RPi
+
     def electric_field(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray = None):
         """
         Calcula el campo eléctrico generado por una carga de línea.
@@ -125,50 +322,280 @@ class InfiniteLineCharge(Charge):
 
         Returns:
             list: Una lista [Ex, Ey, Ez] con las componentes del campo eléctrico.
-                  Si el cálculo es 2D, Ez será un array de ceros.
+                  Si el cálculo es 2D, Ez será None.
         """
+        is3d = self._is3d(Z)
+        coordinates = [X, Y, Z] if is3d else [X, Y]
+        shape = np.broadcast_shapes(*[np.shape(C) for C in coordinates])
+        dtype = np.result_type(*coordinates, np.asarray(self.line_point).dtype, 1.0)
+        Ex = np.zeros(shape, dtype=dtype)
+        Ey = np.zeros(shape, dtype=dtype)
+        Ez = np.zeros(shape, dtype=dtype) if is3d else None
+        self.accumulate_electric_field(X, Y, Z, Ex, Ey, Ez)
+        return [Ex, Ey, Ez]
+    
 
-        # Si es un caso 2D, se define Z de manera auxiliar
-        if Z is None or len(self.line_point) < 3 or len(self.line_direction) < 3:
-            is3d = False
-        else:
-            is3d = True
+    def electric_potential(
+            self,
+            X: np.ndarray,
+            Y: np.ndarray,
+            Z: np.ndarray
+            ):
+        """
+        Calcula el potencial eléctrico generado por una carga puntual (V)
 
-        # Vector que va desde el punto Q de la línea al punto P = (x,y,z)
-        QPx = X - self.line_point[0]
-        QPy = Y - self.line_point[1]
-        QPz = Z - self.line_point[2] if is3d else np.zeros_like(QPx)
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray, opcional): Meshgrid de coordenadas Z.
+                                      Si no se proporciona (o es None),
+                                      se asume un cálculo en 2D.
 
-        # Vector guía de la línea:
-        vx = self.line_direction[0]
-        vy = self.line_direction[1]
-        vz = self.line_direction[2] if is3d else 0
+        Returns:
+            float: V
+        """
 
-        # Vector que va desde el punto más cercano R de la línea al punto P
-        QP_dot_v = (QPx * vx) + (QPy * vy) + (QPz * vz)
-        magnitude_v_squared = vx**2 + vy**2 + vz**2
+        print("Esta función aun no ha sido construida")
+        return 0
 
-        if magnitude_v_squared == 0:
-            raise ValueError("El vector de dirección de la línea no puede ser un vector nulo (0,0,0).")
-        
-        aux = QP_dot_v / magnitude_v_squared
+# 3) Distribución de cargas puntuales (con expansión multipolar de campo lejano)
+def _multi_indices(order: int, dimension: int) -> list:
+    """ Multi-índices k con |k| <= order, ordenados por grado total. """
+    indices = [()]
+    for _ in range(dimension):
+        indices = [k + (j,) for k in indices for j in range(order + 1 - sum(k))]
+    return sorted(indices, key=sum)
+
+def _coulomb_taylor(R: list, order: int) -> dict:
+    """
+    Coeficientes de Taylor a_k = (1/k!) ∂^k (1/|R|) para |k| <= order.
+
+    Usa la recurrencia
+        |R|² |k| a_k + (2|k| - 1) Σ_i R_i a_{k-e_i} + (|k| - 1) Σ_i a_{k-2e_i} = 0
+    """
+    dimension = len(R)
+    inv_R_squared = 1 / sum(Ri**2 for Ri in R)
+    a = {(0,) * dimension: np.sqrt(inv_R_squared)}
+    for k in _multi_indices(order, dimension)[1:]:
+        n = sum(k)
+        first = np.zeros_like(inv_R_squared)
+        second = np.zeros_like(inv_R_squared)
+        for i in range(dimension):
+            if k[i] >= 1:
+                first += R[i] * a[k[:i] + (k[i] - 1,) + k[i + 1:]]
+            if k[i] >= 2:
+                second += a[k[:i] + (k[i] - 2,) + k[i + 1:]]
+        a[k] = -((2 * n - 1) / n * first + (n - 1) / n * second) * inv_R_squared
+    return a
+
+class ChargeDistribution(Charge):
+    def __init__ (
+            self,
+            charge_list: list,
+            multipole_order: int = 8,
+            tolerance: float = 1e-12,
+            ):
+        """
+        Conjunto de cargas puntuales evaluado como un solo objeto.
 
-        RPx = QPx - vx * aux
-        RPy = QPy - vy * aux
-        RPz = QPz - vz * aux
+        Los puntos lejanos (más allá de un radio seguro alrededor del centro de
+        carga) usan una expansión multipolar precalculada; los cercanos se
+        suman carga por carga. Con pocas cargas (no más que términos de la
+        expansión) todos los puntos se suman directo.
 
-        R_squared = RPx**2 + RPy**2 + RPz**2
-        R2 = np.where(R_squared != 0, R_squared, 1e-20)  # evitar división por cero
+        Args:
+            charge_list (list): Cargas puntuales (PointCharge).
+            multipole_order (int): Orden máximo de la expansión multipolar.
+            tolerance (float): Error relativo admitido en el campo lejano.
+                               Determina el radio seguro.
+        """
+        self.charge_list = charge_list
+        self.multipole_order = multipole_order
+        self.positions = np.array([np.asarray(q.position, dtype=float) for q in charge_list])
+        self.magnitudes = np.array([q.magnitude for q in charge_list], dtype=float)
+        self.magnitude = self.magnitudes.sum()
+
+        # Centro de la expansión y radio que encierra todas las cargas
+        weights = np.abs(self.magnitudes)
+        if weights.sum() == 0:
+            weights = np.ones_like(weights)
+        self.position = weights @ self.positions / weights.sum()
+        self.radius = np.max(np.linalg.norm(self.positions - self.position, axis=1))
+
+        # El error de la expansión decae como (radius / r)^(orden + 1)
+        theta = tolerance ** (1 / (multipole_order + 1))
+        self.safe_radius = self.radius / theta
+
+        self._moments = {}
+
+    def multipole_moments(self, dimension: int) -> dict:
+        """
+        Momentos M_k = Σ_j q_j (c - y_j)^k hasta el orden elegido (con caché).
 
-        # Cálculo del campo:
-        multiplying_factor = self.charge_density/(2*pi*epsilon_0*R2)
+        Args:
+            dimension (int): 2 o 3 (número de coordenadas usadas).
 
-        Ex = multiplying_factor * RPx
-        Ey = multiplying_factor * RPy
-        Ez = multiplying_factor * RPz if is3d else None
+        Returns:
+            dict: Momentos indexados por multi-índice k.
+        """
+        if dimension not in self._moments:
+            d = self.position[:dimension] - self.positions[:, :dimension]
+            moments = {}
+            for k in _multi_indices(self.multipole_order, dimension):
+                moments[k] = np.sum(self.magnitudes * np.prod(d ** np.array(k), axis=1))
+            self._moments[dimension] = moments
+        return self._moments[dimension]
+
+    def uses_multipole(self, dimension: int) -> bool:
+        """
+        Indica si la expansión compensa: tiene (p+1)(p+2)/2 términos en 2D y
+        (p+1)(p+2)(p+3)/6 en 3D, que se evalúan en cada punto lejano igual que
+        las cargas en la suma directa.
+        """
+        return len(_multi_indices(self.multipole_order, dimension)) < len(self.charge_list)
 
-        return [Ex, Ey, Ez]
-    
+    def _split(self, X, Y, Z):
+        """
+        Devuelve (is3d, R relativo al centro, máscara de puntos lejanos).
+        Si la expansión no compensa, R y la máscara son None.
+        """
+        is3d = not (Z is None or self.positions.shape[1] < 3)
+        coordinates = [X, Y, Z] if is3d else [X, Y]
+        if not self.uses_multipole(len(coordinates)):
+            return is3d, None, None
+        R = [np.asarray(Ci, dtype=float) - ci for Ci, ci in zip(coordinates, self.position)]
+        R_squared = sum(Ri**2 for Ri in R)
+        far = R_squared > max(self.safe_radius**2, 1e-4)
+        return is3d, R, far
+
+    def _shape(self, X, Y, Z):
+        is3d = not (Z is None or self.positions.shape[1] < 3)
+        return is3d, np.broadcast_shapes(*[np.shape(C) for C in ([X, Y, Z] if is3d else [X, Y])])
+
+    def accumulate_electric_field(
+            self,
+            X: np.ndarray,
+            Y: np.ndarray,
+            Z: np.ndarray,
+            Ex: np.ndarray,
+            Ey: np.ndarray,
+            Ez: np.ndarray = None,
+            workspace: Workspace = None,
+            ) -> None:
+        """
+        Suma el campo eléctrico de la distribución a Ex, Ey (y Ez). Las cargas
+        cercanas se acumulan una a una con un workspace compartido.
+
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray): Meshgrid de coordenadas Z, o None en 2D.
+            Ex (np.ndarray): Componente x acumulada (se modifica).
+            Ey (np.ndarray): Componente y acumulada (se modifica).
+            Ez (np.ndarray, opcional): Componente z acumulada (se modifica).
+            workspace (Workspace, opcional): Temporales reutilizables.
+        """
+        workspace = workspace if workspace is not None else Workspace()
+        is3d, R, far = self._split(X, Y, Z)
+
+        # Todos los puntos son cercanos: se acumula directo en las salidas
+        if far is None or not np.any(far):
+            for charge in self.charge_list:
+                charge.accumulate_electric_field(X, Y, Z, Ex, Ey, Ez, workspace)
+            return
+
+        # Campo lejano: E_i = -Σ_k (k_i + 1) a_{k+e_i} M_k
+        dimension = len(R)
+        outputs = [Ex, Ey, Ez][:dimension]
+        moments = self.multipole_moments(dimension)
+        a = _coulomb_taylor([Ri[far] for Ri in R], self.multipole_order + 1)
+        for i in range(dimension):
+            if outputs[i] is None:
+                continue
+            E_far = np.zeros(np.count_nonzero(far))
+            for k, M in moments.items():
+                ki = k[:i] + (k[i] + 1,) + k[i + 1:]
+                E_far -= (k[i] + 1) * M * a[ki]
+            outputs[i][far] += 1/(4*pi*epsilon_0) * E_far
+
+        # Campo cercano: suma directa carga por carga
+        near = ~far
+        if np.any(near):
+            Xn, Yn = np.broadcast_to(X, far.shape)[near], np.broadcast_to(Y, far.shape)[near]
+            Zn = np.broadcast_to(Z, far.shape)[near] if is3d else None
+            E_near = [np.zeros(len(Xn), dtype=Ex.dtype) if E is not None else None for E in (Ex, Ey, Ez)]
+            for charge in self.charge_list:
+                charge.accumulate_electric_field(Xn, Yn, Zn, *E_near, workspace)
+            for E, En in zip(outputs, E_near):
+                if E is not None:
+                    E[near] += En
+
+    def accumulate_electric_potential(
+            self,
+            X: np.ndarray,
+            Y: np.ndarray,
+            Z: np.ndarray,
+            V: np.ndarray,
+            workspace: Workspace = None,
+            ) -> None:
+        """
+        Suma el potencial eléctrico de la distribución a V. Las cargas
+        cercanas se acumulan una a una con un workspace compartido.
+
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray): Meshgrid de coordenadas Z, o None en 2D.
+            V (np.ndarray): Potencial acumulado (se modifica).
+            workspace (Workspace, opcional): Temporales reutilizables.
+        """
+        workspace = workspace if workspace is not None else Workspace()
+        is3d, R, far = self._split(X, Y, Z)
+
+        # Todos los puntos son cercanos: se acumula directo en V
+        if far is None or not np.any(far):
+            for charge in self.charge_list:
+                charge.accumulate_electric_potential(X, Y, Z, V, workspace)
+            return
+
+        # Potencial lejano: V = Σ_k a_k M_k
+        moments = self.multipole_moments(len(R))
+        a = _coulomb_taylor([Ri[far] for Ri in R], self.multipole_order)
+        V_far = np.zeros(np.count_nonzero(far))
+        for k, M in moments.items():
+            V_far += M * a[k]
+        V[far] += 1/(4*pi*epsilon_0) * V_far
+
+        # Potencial cercano: suma directa carga por carga
+        near = ~far
+        if np.any(near):
+            Xn, Yn = np.broadcast_to(X, far.shape)[near], np.broadcast_to(Y, far.shape)[near]
+            Zn = np.broadcast_to(Z, far.shape)[near] if is3d else None
+            V_near = np.zeros(len(Xn), dtype=V.dtype)
+            for charge in self.charge_list:
+                charge.accumulate_electric_potential(Xn, Yn, Zn, V_near, workspace)
+            V[near] += V_near
+
+    def electric_field(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray = None):
+        """
+        Calcula el campo eléctrico de la distribución de cargas.
+
+        Args:
+            X (np.ndarray): Meshgrid de coordenadas X.
+            Y (np.ndarray): Meshgrid de coordenadas Y.
+            Z (np.ndarray, opcional): Meshgrid de coordenadas Z.
+                                      Si no se proporciona (o es None),
+                                      se asume un cálculo en 2D.
+
+        Returns:
+            list: Una lista [Ex, Ey, Ez] con las componentes del campo eléctrico.
+                  Si el cálculo es 2D, Ez será None.
+        """
+        is3d, shape = self._shape(X, Y, Z)
+        E = [np.zeros(shape) for _ in range(3 if is3d else 2)]
+        self.accumulate_electric_field(X, Y, Z, *E)
+        Ez = E[2] if is3d else None
+        return [E[0], E[1], Ez]
 
     def electric_potential(
             self,
@@ -177,7 +604,7 @@ class InfiniteLineCharge(Charge):
             Z: np.ndarray
             ):
         """
-        Calcula el potencial eléctrico generado por una carga puntual (V)
+        Calcula el potencial eléctrico de la distribución de cargas (V)
 
         Args:
             X (np.ndarray): Meshgrid de coordenadas X.
@@ -189,9 +616,38 @@ class InfiniteLineCharge(Charge):
         Returns:
             float: V
         """
+        _, shape = self._shape(X, Y, Z)
+        V = np.zeros(shape)
+        self.accumulate_electric_potential(X, Y, Z, V)
+        return V
 
-        print("Esta función aun no ha sido construida")
-        return 0
+# 4) Flechas normalizadas para quiver
+def squash_field(components: list, p: float = 10, percentile: float = 99, sample_size: int = 65536) -> list:
+    """
+    Escala los vectores para graficarlos con quiver: los pequeños conservan
+    su proporción y los grandes (cerca de las cargas) se saturan en 1.
+
+    Args:
+        components (list): Componentes [Ex, Ey] o [Ex, Ey, Ez] del campo.
+        p (float): Dureza de la saturación x / (1 + x^p)^(1/p).
+        percentile (float): Percentil de |E| que se toma como magnitud 1.
+        sample_size (int): El percentil se estima sobre una muestra
+                           equiespaciada de a lo más sample_size puntos,
+                           no sobre toda la malla.
+
+    Returns:
+        list: Componentes escaladas, con la forma de las originales.
+    """
+    E_mag = np.sqrt(sum(np.square(component) for component in components))
+    flat = E_mag.ravel()
+    normalizing_cap = np.percentile(flat[::max(1, flat.size // sample_size)], percentile)
+    normalizing_cap = normalizing_cap if normalizing_cap != 0 else 1e-20  # evitar división por cero
+
+    # Factor común: squash(|E| / tope) / |E|
+    x = E_mag / normalizing_cap
+    factor = x / ((1 + x**p)**(1/p))
+    factor /= np.where(E_mag != 0, E_mag, 1e-20)  # evitar división por cero
+    return [component * factor for component in components]
 
 # Debug::
 # print(f"e = {e}")
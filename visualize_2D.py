@@ -37,33 +37,24 @@ print(f"Shape of the meshgrid: {X.shape}")
 Ex = np.zeros_like(X)
 Ey = np.zeros_like(Y)
 
+# Los temporales de cada carga se reutilizan (no se reserva memoria por carga)
+workspace = utils.Workspace()
+
 for charge in point_charge_list:
-    E_differential = charge.electric_field(X, Y)
     # Sumar componentes del campo
-    Ex += E_differential[0]
-    Ey += E_differential[1]
+    charge.accumulate_electric_field(X, Y, None, Ex, Ey, workspace=workspace)
 
 for charge in line_charge_list:
-    E_differential = charge.electric_field(X, Y)
     # Sumar componentes del campo
-    Ex += E_differential[0]
-    Ey += E_differential[1]
+    charge.accumulate_electric_field(X, Y, None, Ex, Ey, workspace=workspace)
 
 # PLOT:
 fig = plt.figure(figsize=(9, 9))
 ax = fig.add_subplot()
 
 # === Graficar el campo eléctrico ===
-E_mag = np.sqrt(Ex**2 + Ey**2)
-
-def squash(x, p=10):
-    return x / ((1 + x**p)**(1/p))
-
-normalizing_cap = np.percentile(E_mag, 99)
-squashing = squash(E_mag / normalizing_cap)
-
-Ex_squashed = np.multiply(Ex, squashing) / E_mag
-Ey_squashed = np.multiply(Ey, squashing) / E_mag
+# Magnitud 1 en el percentil 99 de |E| (estimado con una muestra de la malla)
+Ex_squashed, Ey_squashed = utils.squash_field([Ex, Ey])
 # ax.quiver(X, Y, Ex, Ey, width=0.0010, scale=7e12)
 ax.quiver(X, Y, Ex_squashed, Ey_squashed, width=0.0010)
 
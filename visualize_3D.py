@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.constants import e, epsilon_0, pi
 import utils
+import ewald
+import vtk_export
 
 # Crear 2 cargas puntuales y visualizar su campo en 2D
 point_charge_list = []
@@ -22,6 +24,17 @@ d2 = 1
 # line_charge_list.append(utils.InfiniteLineCharge(1, [0 , d2, 0], [1, 0, 0]))
 # line_charge_list.append(utils.InfiniteLineCharge(-1, [0 , -d2, 0], [1, 0, 0]))
 
+# Redes periódicas (suma de Ewald en lugar de replicar celdas a mano).
+# La celda unitaria tiene su propia lista de cargas:
+cell_charge_list = []
+# cell_charge_list.append(utils.PointCharge(1, np.array([0.5, 0.5, 0.5])))
+# cell_charge_list.append(utils.PointCharge(-1, np.array([-0.5, -0.5, -0.5])))
+lattice_vectors = [[2, 0, 0], [0, 2, 0], [0, 0, 2]]
+
+periodic_lattice_list = []
+if cell_charge_list:
+    periodic_lattice_list.append(ewald.PeriodicLattice(cell_charge_list, lattice_vectors))
+
 
 print(f"Number of point charges = {len(point_charge_list)}")
 
@@ -42,36 +55,33 @@ Ex = np.zeros_like(X)
 Ey = np.zeros_like(Y)
 Ez = np.zeros_like(Z)
 
+# Los temporales de cada carga se reutilizan (no se reserva memoria por carga)
+workspace = utils.Workspace()
+
 for charge in point_charge_list:
-    E_differential = charge.electric_field(X, Y, Z)
     # Sumar componentes del campo
-    Ex += E_differential[0]
-    Ey += E_differential[1]
-    Ez += E_differential[2]
+    charge.accumulate_electric_field(X, Y, Z, Ex, Ey, Ez, workspace)
 
 for charge in line_charge_list:
-    E_differential = charge.electric_field(X, Y, Z)
     # Sumar componentes del campo
-    Ex += E_differential[0]
-    Ey += E_differential[1]
-    Ez += E_differential[2]
+    charge.accumulate_electric_field(X, Y, Z, Ex, Ey, Ez, workspace)
+
+for lattice in periodic_lattice_list:
+    # Sumar componentes del campo
+    lattice.accumulate_electric_field(X, Y, Z, Ex, Ey, Ez, workspace)
+
+# Exportar a ParaView (VTK ImageData binario):
+export_vtk = False
+if export_vtk:
+    vtk_export.write_vti("visualize_3D.vti", x_space, y_space, z_space, {"E": (Ex, Ey, Ez)})
 
 # PLOT:
 fig = plt.figure(figsize=(9, 9))
 ax = fig.add_subplot(111, projection='3d')
 
 # === Graficar el campo eléctrico ===
-E_mag = np.sqrt(Ex**2 + Ey**2 + Ez**2)
-
-def squash(x, p=10):
-    return x / ((1 + x**p)**(1/p))
-
-normalizing_cap = np.percentile(E_mag, 99)
-squashing = squash(E_mag / normalizing_cap)
-
-Ex_squashed = np.multiply(Ex, squashing) / E_mag
-Ey_squashed = np.multiply(Ey, squashing) / E_mag
-Ez_squashed = np.multiply(Ez, squashing) / E_mag
+# Magnitud 1 en el percentil 99 de |E| (estimado con una muestra de la malla)
+Ex_squashed, Ey_squashed, Ez_squashed = utils.squash_field([Ex, Ey, Ez])
 
 # ax.quiver(X, Y, Ex, Ey, width=0.0010, scale=7e12)
 ax.quiver(X, Y, Z, Ex_squashed, Ey_squashed, Ez_squashed)
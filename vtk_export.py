@@ -0,0 +1,128 @@
+import numpy as np
+""" Exportación de campos 3D a VTK ImageData (.vti) binario, para ParaView.
+
+    Los datos se escriben en la sección 'appended' en bruto (sin base64 ni
+    compresión) y se recorren por bloques de filas y, así que la memoria
+    usada no depende del tamaño de la malla. Sirve tanto para arreglos en
+    memoria (visualize_3D.py, la cáscara esférica) como para los memmaps de
+    chunked_field.ChunkedField.
+"""
+# Nombres de tipo de VTK según el dtype de numpy
+_vtk_types = {np.dtype(np.float32): "Float32", np.dtype(np.float64): "Float64"}
+
+
+def _spacing(space: np.ndarray) -> float:
+    """ Paso de un eje; ImageData solo admite mallas uniformes. """
+    if len(space) < 2:
+        return 1.0
+    steps = np.diff(space)
+    if not np.allclose(steps, steps[0], rtol=1e-9, atol=0):
+        raise ValueError("La exportación a ImageData requiere ejes equiespaciados.")
+    return float(steps[0])
+
+
+def write_vti(
+        filename: str,
+        x_space: np.ndarray,
+        y_space: np.ndarray,
+        z_space: np.ndarray,
+        point_data: dict,
+        dtype: type = np.float64,
+        slab: int = 16,
+        ) -> None:
+    """
+    Escribe campos definidos sobre np.meshgrid(x_space, y_space, z_space).
+
+    Args:
+        filename (str): Ruta del archivo .vti.
+        x_space (np.ndarray): Coordenadas x (equiespaciadas).
+        y_space (np.ndarray): Coordenadas y (equiespaciadas).
+        z_space (np.ndarray): Coordenadas z (equiespaciadas).
+        point_data (dict): Nombre -> arreglo de forma (ny, nx, nz) para un
+                           escalar, o tupla (Fx, Fy, Fz) para un vector.
+                           Los arreglos pueden ser np.memmap.
+        dtype (type): np.float64 o np.float32 (la mitad de tamaño).
+        slab (int): Filas y leídas por bloque (acota la memoria usada).
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in _vtk_types:
+        raise ValueError("dtype debe ser np.float32 o np.float64.")
+    nx, ny, nz = len(x_space), len(y_space), len(z_space)
+    spacing = (_spacing(x_space), _spacing(y_space), _spacing(z_space))
+    origin = (float(x_space[0]), float(y_space[0]), float(z_space[0]))
+
+    # Normalizar: cada campo como lista de componentes (ny, nx, nz)
+    fields = []
+    for name, data in point_data.items():
+        components = list(data) if isinstance(data, (tuple, list)) else [data]
+        for component in components:
+            if component.shape != (ny, nx, nz):
+                raise ValueError(f"'{name}' debe tener forma {(ny, nx, nz)}.")
+        fields.append((name, components))
+
+    # Cabecera XML con los offsets de cada arreglo en la sección 'appended'
+    point_bytes = nx * ny * nz * dtype.itemsize
+    extent = f"0 {nx - 1} 0 {ny - 1} 0 {nz - 1}"
+    scalars = [name for name, c in fields if len(c) == 1]
+    vectors = [name for name, c in fields if len(c) == 3]
+    attributes = (f' Scalars="{scalars[0]}"' if scalars else "") + (f' Vectors="{vectors[0]}"' if vectors else "")
+    lines = [
+        '<?xml version="1.0"?>',
+        '<VTKFile type="ImageData" version="1.0" byte_order="LittleEndian" header_type="UInt64">',
+        f'  <ImageData WholeExtent="{extent}" Origin="{origin[0]!r} {origin[1]!r} {origin[2]!r}"'
+        f' Spacing="{spacing[0]!r} {spacing[1]!r} {spacing[2]!r}">',
+        f'    <Piece Extent="{extent}">',
+        f'      <PointData{attributes}>',
+    ]
+    offset = 0
+    for name, components in fields:
+        lines.append(f'        <DataArray type="{_vtk_types[dtype]}" Name="{name}"'
+                     f' NumberOfComponents="{len(components)}" format="appended" offset="{offset}"/>')
+        offset += 8 + point_bytes * len(components)
+    lines += [
+        '      </PointData>',
+        '      <CellData/>',
+        '    </Piece>',
+        '  </ImageData>',
+        '  <AppendedData encoding="raw">',
+    ]
+
+    with open(filename, "wb") as f:
+        f.write(("\n".join(lines) + "\n   _").encode("ascii"))
+        for name, components in fields:
+            n_components = len(components)
+            f.write(np.uint64(point_bytes * n_components).astype("<u8").tobytes())
+            start = f.tell()
+            row_bytes = nx * n_components * dtype.itemsize
+            # VTK ordena con x más rápido, luego y, luego z: cada bloque de
+            # filas y se reparte en nz tramos contiguos del archivo.
+            for j0 in range(0, ny, slab):
+                j1 = min(j0 + slab, ny)
+                block = np.empty((nz, j1 - j0, nx, n_components), dtype=dtype.newbyteorder("<"))
+                for c, component in enumerate(components):
+                    block[..., c] = np.transpose(component[j0:j1], (2, 0, 1))
+                for k in range(nz):
+                    f.seek(start + (k * ny + j0) * row_bytes)
+                    f.write(memoryview(block[k]).cast("B"))
+            f.seek(start + point_bytes * n_components)
+        f.write(b"\n  </AppendedData>\n</VTKFile>\n")
+
+
+def write_chunked_field_vti(field, filename: str, dtype: type = np.float64) -> None:
+    """
+    Exporta un chunked_field.ChunkedField (V, E y/o B) sin cargarlo en memoria.
+
+    Args:
+        field (ChunkedField): Campo calculado por ladrillos.
+        filename (str): Ruta del archivo .vti.
+        dtype (type): np.float64 o np.float32.
+    """
+    point_data = {}
+    if "V" in field.arrays:
+        point_data["V"] = field.arrays["V"]
+    for name in ("E", "B"):
+        names = [name + axis for axis in "xyz"]
+        if all(n in field.arrays for n in names):
+            point_data[name] = tuple(field.arrays[n] for n in names)
+    write_vti(filename, field.x_space, field.y_space, field.z_space, point_data,
+              dtype=dtype)